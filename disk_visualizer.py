@@ -1,13 +1,25 @@
+import base64
+import gzip
+import hashlib
 import os
-from contextlib import asynccontextmanager
+import threading
+from contextlib import ExitStack, asynccontextmanager
 from io import BytesIO
-from typing import Generator
+from typing import Any, Generator
 
-from fastapi import Depends, FastAPI
-from fastapi.responses import HTMLResponse, JSONResponse
+import orjson
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import (
+    HTMLResponse,
+    ORJSONResponse,
+    Response,
+    StreamingResponse,
+)
 
+from src.virtual_disk.bitmap import Bitmap
 from src.virtual_disk.config import Config
 from src.virtual_disk.disk import InFileChaCha20EncryptedDisk, InFileDisk
+from src.virtual_disk.disks.infile import BitmapFile
 from src.virtual_disk.protocol import Disk
 
 basedir = os.path.dirname(os.path.abspath(__file__))
@@ -17,8 +29,67 @@ if not os.path.exists(instance):
     os.mkdir(instance)
 filepath = os.path.join(instance, "large_disk.bin.enc")
 dashboard_path = os.path.join(template, "dashboard.html")
-with open(dashboard_path, "r") as f:
-    html: str = f.read()
+# NOTE: the dashboard is static (no templating), its body, gzip body and ETag are built once at import
+with open(dashboard_path, "rb") as f:
+    HTML_BYTES: bytes = f.read()
+HTML_GZIP_BYTES: bytes = gzip.compress(HTML_BYTES)
+ETAG: str = '"' + hashlib.sha1(HTML_BYTES).hexdigest() + '"'
+
+
+def bitmap_to_b64(bitmap: Bitmap) -> bytes:
+    """Packed bitmap bytes (least significant bit first) as base64, unpacked by the dashboard."""
+    return base64.b64encode(bitmap._data)
+
+
+# NOTE: the bitmaps are part of the key (compared by identity) so a freshly opened disk never hits a stale body,
+# it is dropped whenever the disk file changes on disk
+_CACHE: dict[str, Any] = {"key": None, "chunks": None}
+
+
+PASSWORD: bytes = b"very secure password :->"
+
+# NOTE: opening the encrypted disk costs a sha256 + HKDF + cipher setup, so it is done once per (path, password),
+# only the bitmaps are read again when the file was modified by another process
+_DISK_CACHE: dict[tuple[str, bytes], Disk] = {}
+# NOTE: (st_mtime_ns, st_size) of the file when the bitmaps of the cached disk were read
+_DISK_STAT: dict[tuple[str, bytes], tuple[int, int]] = {}
+_DISK_LOCK = threading.Lock()
+_DISK_EXIT_STACK = ExitStack()
+
+
+def open_disk(path: str, password: bytes) -> Disk:
+    key = (path, hashlib.sha256(password).digest())
+    with _DISK_LOCK:
+        disk = _DISK_CACHE.get(key)
+        if disk is None:
+            f = _DISK_EXIT_STACK.enter_context(open(path, "rb"))
+            # disk = InFileDisk(f)
+            disk = _DISK_EXIT_STACK.enter_context(
+                InFileChaCha20EncryptedDisk(f, password=password)
+            )
+            _DISK_CACHE[key] = disk
+            _DISK_STAT[key] = file_signature(path)
+        else:
+            signature = file_signature(path)
+            if _DISK_STAT[key] != signature:
+                for bitmap in (disk.inodes_bitmap, disk.blocks_bitmap):
+                    if isinstance(bitmap, BitmapFile):
+                        bitmap.reload()
+                _CACHE["key"] = _CACHE["chunks"] = None
+                _DISK_STAT[key] = signature
+    return disk
+
+
+def file_signature(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def close_disks() -> None:
+    with _DISK_LOCK:
+        _DISK_CACHE.clear()
+        _DISK_STAT.clear()
+        _DISK_EXIT_STACK.close()
 
 
 def get_disk() -> Generator[Disk]:
@@ -31,42 +102,76 @@ def get_disk() -> Generator[Disk]:
     #         num_inodes=32
     #     )
     # )
-    with open(filepath, "rb") as f:
-        # disk = InFileDisk(f)
-        disk = InFileChaCha20EncryptedDisk(f, password=b"very secure password :->")
-        with disk:
-            yield disk
+    disk = open_disk(filepath, PASSWORD)
+    # NOTE: requests share one file handle, seek + read must not interleave
+    with _DISK_LOCK:
+        yield disk
 
 
-app = FastAPI(title="Disk Visualizer")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    open_disk(filepath, PASSWORD)
+    try:
+        yield
+    finally:
+        close_disks()
+
+
+app = FastAPI(
+    title="Disk Visualizer", default_response_class=ORJSONResponse, lifespan=lifespan
+)
 
 
 @app.get("/api/disk")
 def disk_state(disk: Disk = Depends(get_disk)):
-    state = {
-        "block_size": disk.config.block_size,
-        "block_count": disk.blocks_bitmap._size,
-        "inode_count": disk.inodes_bitmap._size,
-        "blocks_free": disk.blocks_bitmap.free_count(),
-        "inodes_free": disk.inodes_bitmap.free_count(),
-        "blocks": [
-            1 if disk.blocks_bitmap._get(i) else 0
-            for i in range(disk.blocks_bitmap._size)
-        ],
-        "inodes": [
-            1 if disk.inodes_bitmap._get(i) else 0
-            for i in range(disk.inodes_bitmap._size)
-        ],
-    }
-    return JSONResponse(state)
+    blocks_bitmap, inodes_bitmap = disk.blocks_bitmap, disk.inodes_bitmap
+    key = (blocks_bitmap, blocks_bitmap._version, inodes_bitmap, inodes_bitmap._version)
+    if _CACHE["key"] != key:
+        state = {
+            "block_size": disk.config.block_size,
+            "block_count": blocks_bitmap._size,
+            "inode_count": inodes_bitmap._size,
+            "blocks_free": blocks_bitmap.free_count(),
+            "inodes_free": inodes_bitmap.free_count(),
+        }
+        # NOTE: dumping ourself skips fastapi's jsonable_encoder walk over the state,
+        # the large base64 bitmaps are streamed as separate chunks and never joined into one body
+        _CACHE["key"] = key
+        _CACHE["chunks"] = (
+            orjson.dumps(state)[:-1] + b',"blocks_b64":"',
+            bitmap_to_b64(blocks_bitmap),
+            b'","inodes_b64":"',
+            bitmap_to_b64(inodes_bitmap),
+            b'"}',
+        )
+    return StreamingResponse(iter(_CACHE["chunks"]), media_type="application/json")
 
 
 @app.get("/", response_class=HTMLResponse)
-def dashboard():
-    return HTMLResponse(html)
+def dashboard(request: Request):
+    headers = {
+        "ETag": ETAG,
+        "Cache-Control": "public, max-age=300",
+        "Vary": "Accept-Encoding",
+    }
+    if request.headers.get("if-none-match") == ETAG:
+        return Response(status_code=304, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return HTMLResponse(HTML_GZIP_BYTES, headers=headers)
+    return HTMLResponse(HTML_BYTES, headers=headers)
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # NOTE: every worker opens its own disk (read only) through the lifespan, "auto" picks uvloop when installed
+    uvicorn.run(
+        "disk_visualizer:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="httptools",
+        access_log=False,
+        workers=os.cpu_count() or 1,
+    )
@@ -1,12 +1,26 @@
+import re
+from typing import Iterator
+
 from .utils import ceil_division
 
+# NOTE: matching a run of 0xFF is done by the C regex engine, its end is the first byte with a free bit
+FULL_BYTES_RUN: re.Pattern[bytes] = re.compile(rb"\xff*")
+
 
 class Bitmap:
-    __slots__ = ("_size", "_data")
+    __slots__ = ("_size", "_data", "_version", "_popcount_cache")
 
     def __init__(self, size: int):
         self._size: int = size
-        self._data: bytearray = bytearray(ceil_division(size, 8))
+        # NOTE: bumped on every set/clear, lets callers cache derived state
+        self._version: int = 0
+        # NOTE: (version, popcount) of the last count, reused until a bit changes
+        self._popcount_cache: tuple[int, int] = (-1, 0)
+        self._set_data(bytearray(ceil_division(size, 8)))
+
+    def _set_data(self, data: bytearray) -> None:
+        """Bind the backing bytearray of the bitmap."""
+        self._data: bytearray = data
 
     def __repr__(self) -> str:
         data = (
@@ -15,44 +29,102 @@ class Bitmap:
         )
         return f"{self.__class__.__name__}(size={self._size}, data=[{''.join(data)}\n])"
 
+    def _set_unchecked(self, index: int) -> None:
+        self._data[index >> 3] |= 1 << (index & 7)
+        self._version += 1
+
+    def _clear_unchecked(self, index: int) -> None:
+        self._data[index >> 3] &= ~(1 << (index & 7))
+        self._version += 1
+
     def set(self, index: int):
         if not (0 <= index < self._size):
             raise IndexError("Bitmap index out of range")
-        self._data[index // 8] |= 1 << (index % 8)
+        self._set_unchecked(index)
 
     def clear(self, index: int):
         if not (0 <= index < self._size):
             raise IndexError("Bitmap index out of range")
-        self._data[index // 8] &= ~(1 << (index % 8))
+        self._clear_unchecked(index)
+
+    def set_range(self, start: int, stop: int) -> None:
+        """Set every bit in [start, stop), whole bytes are filled at once."""
+        if not (0 <= start <= stop <= self._size):
+            raise IndexError("Bitmap index out of range")
+        if start == stop:
+            return None
+        data: bytearray = self._data
+        first, last = start >> 3, (stop - 1) >> 3
+        if first == last:
+            data[first] |= ((1 << (stop - start)) - 1) << (start & 7)
+        else:
+            data[first] |= (0xFF << (start & 7)) & 0xFF
+            data[first + 1 : last] = b"\xff" * (last - first - 1)
+            data[last] |= (1 << (((stop - 1) & 7) + 1)) - 1
+        self._version += 1
 
     def _get(self, index: int) -> bool:
-        return bool(self._data[index // 8] & (1 << (index % 8)))
+        return bool(self._data[index >> 3] & (1 << (index & 7)))
 
     def get(self, index: int) -> bool:
         if not (0 <= index < self._size):
             raise IndexError("Bitmap index out of range")
-        return self._get(index)
+        # NOTE: inlined _get, get sits in the hottest loops and a call frame costs more than the bit op
+        return bool(self._data[index >> 3] >> (index & 7) & 1)
+
+    def popcount(self) -> int:
+        """Count the 1 bits (used slots), one big int popcount at C speed."""
+        version, count = self._popcount_cache
+        if version != self._version:
+            count = int.from_bytes(self._data, byteorder="little").bit_count()
+            self._popcount_cache = (self._version, count)
+        return count
 
     def free_count(self) -> int:
-        return sum(
-            8 - value.bit_count() for value in self._data
-        )  # NOTE: self._data is 0x00 so no need for handling last bits beyond _size...
+        # NOTE: bits beyond _size are always 0x00 so they never count as used...
+        return self._size - self.popcount()
+
+    def iter_ones(self) -> Iterator[int]:
+        """Yield the index of every 1 bit (used slot) in increasing order."""
+        data: bytearray = self._data
+        # NOTE: 64 bit words, an empty word costs a single check
+        for base in range(0, len(data), 8):
+            word = int.from_bytes(data[base : base + 8], byteorder="little")
+            while word:
+                lowest = word & -word
+                yield base * 8 + lowest.bit_length() - 1
+                word ^= lowest
+
+    def iter_zeros(self) -> Iterator[int]:
+        """Yield the index of every 0 bit (free slot) in increasing order."""
+        data: bytearray = self._data
+        size: int = self._size
+        for base in range(0, len(data), 8):
+            chunk = data[base : base + 8]
+            mask = (1 << (len(chunk) * 8)) - 1
+            word = ~int.from_bytes(chunk, byteorder="little") & mask
+            while word:
+                lowest = word & -word
+                index = base * 8 + lowest.bit_length() - 1
+                if index >= size:  # NOTE: only padding bits of the last byte are left
+                    return
+                yield index
+                word ^= lowest
 
     def find_free(self) -> int:
         """Find first 0 bit (free slot)"""
-        for idx, value in enumerate(self._data):
-            if value == 0xFF:
-                continue
-            base = idx * 8
-            base_end = min(base + 8, self._size)
-            for index in range(base, base_end):
-                if self._get(index):
-                    continue
+        data: bytearray = self._data
+        idx: int = FULL_BYTES_RUN.match(data).end()  # type: ignore[union-attr] # always matches
+        if idx < len(data):
+            inv = ~data[idx] & 0xFF
+            # NOTE: inv & -inv isolates the lowest free bit, bit_length gives its position
+            index = idx * 8 + (inv & -inv).bit_length() - 1
+            if index < self._size:  # else only padding bits of the last byte are free
                 return index
         raise OSError(f"{self.__class__.__name__} is full, no more free slot")
 
     def find_and_flip_free(self) -> int:
         """Find first 0 bit (free slot) and flip it."""
         index = self.find_free()
-        self.set(index)
+        self._set_unchecked(index)  # NOTE: find_free only returns in range indexes
         return index
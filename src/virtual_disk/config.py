@@ -1,8 +1,17 @@
-from dataclasses import dataclass
-from functools import cached_property
+from dataclasses import dataclass, field
+from struct import Struct
+from typing import ByteString, Callable
 
-from .constants import NUM_DIRECT_PTR
-from .utils import ceil_division, floor_division
+from .constants import EPOCH_TIME_BYTES, NUM_DIRECT_PTR
+from .utils import (
+    addr_decoder,
+    addr_encoder,
+    addrs_struct,
+    ceil_division,
+    ceil_divider,
+    floor_division,
+    int_code,
+)
 
 
 @dataclass(frozen=True)
@@ -13,42 +22,102 @@ class Config:
     num_blocks: int
     num_inodes: int
 
-    @cached_property
-    def disk_size(self) -> int:
-        return self.block_size * self.num_blocks
-
-    @cached_property
-    def block_addr_length(self) -> int:
-        return ceil_division(self.num_blocks.bit_length(), 8)
-
-    @cached_property
-    def inode_addr_length(self) -> int:
-        return ceil_division(self.num_inodes.bit_length(), 8)
-
-    @cached_property
-    def num_inode_addr_per_block(self) -> int:
-        return floor_division(self.block_size, self.inode_addr_length)
-
-    @cached_property
-    def num_inode_addr_double_range(self) -> int:
-        return self.num_inode_addr_per_block * self.num_inode_addr_per_block
-
-    @cached_property
-    def num_inode_addr_triple_range(self) -> int:
-        return self.num_inode_addr_double_range * self.num_inode_addr_per_block
-
-    @cached_property
-    def max_file_size(self) -> int:
-        return (
-            NUM_DIRECT_PTR
-            + self.num_inode_addr_per_block
-            + self.num_inode_addr_double_range
-            + self.num_inode_addr_triple_range
+    # NOTE: derived values are plain attributes filled in __post_init__, they are read in every I/O path
+    disk_size: int = field(init=False, repr=False, compare=False)
+    block_addr_length: int = field(init=False, repr=False, compare=False)
+    inode_addr_length: int = field(init=False, repr=False, compare=False)
+    num_inode_addr_per_block: int = field(init=False, repr=False, compare=False)
+    num_inode_addr_double_range: int = field(init=False, repr=False, compare=False)
+    num_inode_addr_triple_range: int = field(init=False, repr=False, compare=False)
+    max_file_size: int = field(init=False, repr=False, compare=False)
+    max_file_size_length: int = field(init=False, repr=False, compare=False)
+    # NOTE: blocks needed for a size, ceil(size / block_size) by a shift when possible
+    ceil_blocks: Callable[[int], int] = field(init=False, repr=False, compare=False)
+    # NOTE: slice of every address slot of an indirect block, indexed instead of computing offsets
+    addr_slices: tuple[slice, ...] = field(init=False, repr=False, compare=False)
+    # NOTE: one shared all NULL_BYTES block, slice assigned to clear blocks without allocating
+    zero_block: bytes = field(init=False, repr=False, compare=False)
+    # NOTE: codecs built once per Config, the inode and indirect block layouts never change
+    inode_struct: Struct = field(init=False, repr=False, compare=False)
+    block_addrs_struct: Struct = field(init=False, repr=False, compare=False)
+    encode_block_addr: Callable[[int], bytes] = field(
+        init=False, repr=False, compare=False
+    )
+    decode_block_addr: Callable[[ByteString, int], int] = field(
+        init=False, repr=False, compare=False
+    )
+    # NOTE: directory entries point to inodes, so they use the inode address length
+    encode_inode_addr: Callable[[int], bytes] = field(
+        init=False, repr=False, compare=False
+    )
+    decode_inode_addr: Callable[[ByteString, int], int] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        block_addr_length = ceil_division(self.num_blocks.bit_length(), 8)
+        inode_addr_length = ceil_division(self.num_inodes.bit_length(), 8)
+        # NOTE: indirect blocks hold block pointers, counting them by the wider of the two
+        # address lengths never overflows a block and keeps the count of every image
+        # whose block addresses are no wider than its inode addresses
+        per_block = floor_division(
+            self.block_size, max(block_addr_length, inode_addr_length)
+        )
+        double_range = per_block * per_block
+        triple_range = double_range * per_block
+        max_file_size = (
+            NUM_DIRECT_PTR + per_block + double_range + triple_range
         ) * self.block_size
+        # NOTE: the st_size width is derived from the count by the inode address length
+        # as it always was, so the inode layout of existing images is unchanged
+        inode_per_block = floor_division(self.block_size, inode_addr_length)
+        max_file_size_length = ceil_division(
+            (
+                (NUM_DIRECT_PTR + inode_per_block + inode_per_block**2 + inode_per_block**3)
+                * self.block_size
+            ).bit_length(),
+            8,
+        )
+
+        # NOTE: object.__setattr__ as the dataclass is frozen
+        object.__setattr__(self, "disk_size", self.block_size * self.num_blocks)
+        object.__setattr__(self, "block_addr_length", block_addr_length)
+        object.__setattr__(self, "inode_addr_length", inode_addr_length)
+        object.__setattr__(self, "num_inode_addr_per_block", per_block)
+        object.__setattr__(self, "num_inode_addr_double_range", double_range)
+        object.__setattr__(self, "num_inode_addr_triple_range", triple_range)
+        object.__setattr__(self, "max_file_size", max_file_size)
+        object.__setattr__(
+            self,
+            "addr_slices",
+            tuple(
+                slice(off, off + block_addr_length)
+                for off in range(0, per_block * block_addr_length, block_addr_length)
+            ),
+        )
+        object.__setattr__(self, "zero_block", bytes(self.block_size))
+        object.__setattr__(self, "ceil_blocks", ceil_divider(self.block_size))
+        object.__setattr__(self, "max_file_size_length", max_file_size_length)
 
-    @cached_property
-    def max_file_size_length(self) -> int:
-        return ceil_division(self.max_file_size.bit_length(), 8)
+        # NOTE: inode layout: mode, size, mtime, ctime, directs, indirect, double, triple
+        # then NULL_BYTES pad bytes up to inode_size, so pack builds the whole inode
+        inode_format = (
+            ">B"
+            + int_code(max_file_size_length)
+            + int_code(EPOCH_TIME_BYTES) * 2
+            + int_code(block_addr_length) * (NUM_DIRECT_PTR + 3)
+        )
+        inode_padding = max(0, self.inode_size - Struct(inode_format).size)
+        object.__setattr__(
+            self, "inode_struct", Struct(f"{inode_format}{inode_padding}x")
+        )
+        object.__setattr__(
+            self, "block_addrs_struct", addrs_struct(block_addr_length, per_block)
+        )
+        object.__setattr__(self, "encode_block_addr", addr_encoder(block_addr_length))
+        object.__setattr__(self, "decode_block_addr", addr_decoder(block_addr_length))
+        object.__setattr__(self, "encode_inode_addr", addr_encoder(inode_addr_length))
+        object.__setattr__(self, "decode_inode_addr", addr_decoder(inode_addr_length))
 
     def __str__(self):
         nl = "\n" + " " * len(self.__class__.__name__)
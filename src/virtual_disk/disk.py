@@ -5,7 +5,8 @@ from .disks.inmemory import InMemoryDisk
 try:
     from .disks.infile_encrypted import InFileChaCha20EncryptedDisk # pyright: ignore[reportAssignmentType]
 except ImportError:
-    class InFileChaCha20EncryptedDisk:
+    # NOTE: only defined when cryptography is missing, it stands in for the real class
+    class InFileChaCha20EncryptedDisk:  # type: ignore[no-redef]
         def __init__(self, *args, **kwargs):
             raise ImportError(
                 "Encrypted disk support requires the 'crypto' extra.\n"
@@ -16,18 +16,36 @@ CHA_CHA_20_BLOCK_SIZE: int = 64
 
 NULL_BYTES: bytes = b"\x00"
 
+# NOTE: every possible in-block seek offset maps to a prebuilt run of zeros used to burn the keystream
+_ZEROS: tuple[bytes, ...] = tuple(bytes(i) for i in range(CHA_CHA_20_BLOCK_SIZE))
+
 
 class HkdfHmac:
     HMAC_SIZE: int = 32
+    KEY_CACHE_SIZE: int = 64
+
+    # NOTE: keyed on sha256(password) so the cache never keeps the password itself around
+    _key_cache: dict[tuple[bytes, bytes, bytes], bytes] = {}
+
+    @classmethod
+    def _auth_key(cls, password: bytes, nonce: bytes, info: bytes) -> bytes:
+        cache_key = (sha256(password).digest(), nonce, info)
+        auth_key: bytes | None = cls._key_cache.get(cache_key)
+        if auth_key is None:
+            auth_key = HKDF(
+                algorithm=hashes.SHA256(),
+                length=cls.HMAC_SIZE,
+                salt=cls.__name__.encode() + b":nonce:" + nonce,
+                info=info,
+            ).derive(password)
+            if len(cls._key_cache) >= cls.KEY_CACHE_SIZE:  # evict the oldest entry
+                cls._key_cache.pop(next(iter(cls._key_cache)), None)
+            cls._key_cache[cache_key] = auth_key
+        return auth_key
 
     @classmethod
     def make(cls, password: bytes, nonce: bytes, info: bytes) -> bytes:
-        auth_key: bytes = HKDF(
-            algorithm=hashes.SHA256(),
-            length=cls.HMAC_SIZE,
-            salt=cls.__name__.encode() + b":nonce:" + nonce,
-            info=info,
-        ).derive(password)
+        auth_key: bytes = cls._auth_key(password, nonce, info)
         auth_tag: bytes = hmac.new(auth_key, nonce, sha256).digest()
         return auth_tag
 
@@ -37,12 +55,7 @@ class HkdfHmac:
     ) -> bool:
         if len(stored_tag) != cls.HMAC_SIZE:
             raise ValueError(f"{len(stored_tag)=} must be of size: {cls.HMAC_SIZE}")
-        auth_key: bytes = HKDF(
-            algorithm=hashes.SHA256(),
-            length=cls.HMAC_SIZE,
-            salt=cls.__name__.encode() + b":nonce:" + nonce,
-            info=info,
-        ).derive(password)
+        auth_key: bytes = cls._auth_key(password, nonce, info)
         auth_tag: bytes = hmac.new(auth_key, nonce, sha256).digest()
         return hmac.compare_digest(auth_tag, stored_tag)
 
@@ -69,7 +82,7 @@ class CipherChaCha20:
         )
 
         if block_offset:  # Burn the keystream until we reach byte offset
-            self.context.update(NULL_BYTES * block_offset)
+            self.context.update(_ZEROS[block_offset])
 
     def update(self, data: ByteString) -> ByteString:
         return self.context.update(data)
@@ -1,9 +1,11 @@
+import mmap
 import os
+from collections import OrderedDict
 from enum import IntEnum
+from io import RawIOBase
 from types import TracebackType
-from typing import BinaryIO, ByteString, Iterator, Self
+from typing import BinaryIO, ByteString, Callable, Iterable, Iterator, Self
 
-from .. import protocol
 from ..bitmap import Bitmap
 from ..config import Config
 from ..constants import NULL_BYTES
@@ -13,6 +15,12 @@ from ..utils import ceil_division
 from . import BaseDisk
 
 SUPER_BLOCK_DATA_LENGTH = 12
+# NOTE: larger than the default 8 KiB so seeks between nearby inodes/blocks stay inside the buffer
+FILE_BUFFER_SIZE = 64 * 1024
+# NOTE: number of most recently used inode/block views kept by InodesList/BlocksList
+INODE_CACHE_SIZE = 128
+BLOCK_CACHE_SIZE = 32
+NUM_SUPER_BLOCK_FIELDS = 4  # block_size, inode_size, num_blocks, num_inodes
 
 
 class InFileDiskType(IntEnum):
@@ -20,18 +28,175 @@ class InFileDiskType(IntEnum):
     CHA_CHA_20_ENCRYPTED = 1
 
 
+# NOTE: positional I/O fuses seek + read/write into one syscall, not available on windows
+HAS_POSITIONAL_IO: bool = hasattr(os, "pread") and hasattr(os, "pwrite")
+HAS_PREADV: bool = hasattr(os, "preadv")
+# NOTE: PositionTrackingFile bypasses the buffer of a file with a descriptor, so it is only kept
+# when every read/write goes through the file itself
+FILE_BUFFERING: int = 0 if HAS_POSITIONAL_IO else FILE_BUFFER_SIZE
+# NOTE: prefaults the mapped pages so the first sweep over the bitmap has no minor faults, linux only
+MAP_POPULATE: int = getattr(mmap, "MAP_POPULATE", 0)
+
+
+class PositionTrackingFile(RawIOBase, BinaryIO):
+    """Wrap a file and remember its offset, a seek to the current offset is skipped.
+
+    When the file has a real file descriptor every read/write is a single
+    os.pread/os.pwrite at the tracked offset and seek never reaches the kernel,
+    the buffer of the wrapped file is then bypassed. readline, iteration and
+    writelines come from RawIOBase and go through read/write below.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file: BinaryIO = file
+        self._pos: int = file.tell()
+        self._fd: int | None = None
+        if HAS_POSITIONAL_IO:
+            try:
+                fd: int = file.fileno()
+            except (OSError, ValueError):  # NOTE: BytesIO like, io.UnsupportedOperation
+                pass
+            else:
+                file.flush()  # NOTE: nothing may be left in its buffer once bypassed
+                self._fd = fd
+
+    @property
+    def closed(self) -> bool:
+        return self.file.closed
+
+    def writable(self) -> bool:
+        return self.file.writable()
+
+    def seekable(self) -> bool:
+        return self.file.seekable()
+
+    def readable(self) -> bool:
+        return self.file.readable()
+
+    def tell(self) -> int:
+        return self._pos
+
+    def truncate(self, size: int | None = None) -> int:
+        if self._fd is None:
+            return self.file.truncate(size)
+        size = self._pos if size is None else size
+        os.ftruncate(self._fd, size)
+        return size
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __del__(self) -> None:
+        # NOTE: IOBase closes on collection, the wrapped file is only closed by an explicit close
+        return None
+
+    def seek(self, pos: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET and pos == self._pos:
+            return pos
+        if self._fd is None:
+            self._pos = self.file.seek(pos, whence)
+            return self._pos
+        if whence == os.SEEK_CUR:
+            pos += self._pos
+        elif whence == os.SEEK_END:
+            pos += os.fstat(self._fd).st_size
+        elif whence != os.SEEK_SET:
+            raise ValueError(f"invalid {whence=}")
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def read(self, size: int = -1) -> bytes:  # type: ignore[override]
+        data: bytes
+        if self._fd is None:
+            data = self.file.read(size)
+        else:
+            if size < 0:
+                size = max(0, os.fstat(self._fd).st_size - self._pos)
+            data = os.pread(self._fd, size, self._pos)
+        self._pos += len(data)
+        return data
+
+    def readinto(self, buffer: "bytearray | memoryview", /) -> int:  # type: ignore[override]
+        size: int
+        if self._fd is None:
+            size = self.file.readinto(buffer)  # type: ignore[attr-defined]
+        elif HAS_PREADV:
+            size = os.preadv(self._fd, (buffer,), self._pos)
+        else:
+            data: bytes = os.pread(self._fd, len(buffer), self._pos)
+            size = len(data)
+            buffer[:size] = data
+        self._pos += size
+        return size
+
+    def write(self, buffer: ByteString) -> int:  # type: ignore[override]
+        size: int
+        if self._fd is None:
+            size = self.file.write(buffer)
+        else:
+            size = 0
+            view = memoryview(buffer)
+            while size < len(view):  # NOTE: os.pwrite may write less than asked
+                size += os.pwrite(self._fd, view[size:], self._pos + size)
+        self._pos += size
+        return size
+
+    def pwrite(self, pos: int, buffer: ByteString) -> int:
+        self.seek(pos, os.SEEK_SET)  # NOTE: only moves the offset when positional
+        return self.write(buffer)
+
+    def extend_to(self, size: int) -> None:
+        """Grow the file to size bytes, a sparse os.ftruncate when positional."""
+        if self._fd is not None:
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+            return None
+        self.file.seek(size - 1, os.SEEK_SET)
+        self.file.write(NULL_BYTES)  # NOTE: BytesIO.truncate can't grow
+        self.file.seek(self._pos, os.SEEK_SET)
+
+
+def pwrite(file: BinaryIO, pos: int, buffer: ByteString) -> int:
+    """Write buffer at absolute pos, through the file's own pwrite when it provides one."""
+    write_at = getattr(file, "pwrite", None)
+    if write_at is not None:
+        return write_at(pos, buffer)
+    file.seek(pos, os.SEEK_SET)
+    return file.write(buffer)
+
+
+def positional_writer(file: BinaryIO) -> Callable[[int, ByteString], int]:
+    """Resolve pwrite(pos, buffer) for file once, hot paths keep the bound callable."""
+    write_at = getattr(file, "pwrite", None)
+    if write_at is not None:
+        return write_at
+
+    def seek_and_write(pos: int, buffer: ByteString) -> int:
+        file.seek(pos, os.SEEK_SET)
+        return file.write(buffer)
+
+    return seek_and_write
+
+
 def load_config_from_file(file: BinaryIO) -> Config:
-    block_size = int.from_bytes(
-        file.read(SUPER_BLOCK_DATA_LENGTH), byteorder="big", signed=False
-    )
-    inode_size = int.from_bytes(
-        file.read(SUPER_BLOCK_DATA_LENGTH), byteorder="big", signed=False
-    )
-    num_blocks = int.from_bytes(
-        file.read(SUPER_BLOCK_DATA_LENGTH), byteorder="big", signed=False
-    )
-    num_inodes = int.from_bytes(
-        file.read(SUPER_BLOCK_DATA_LENGTH), byteorder="big", signed=False
+    # NOTE: the 4 fields are read with a single call and sliced out of the buffer
+    header: bytes = file.read(SUPER_BLOCK_DATA_LENGTH * NUM_SUPER_BLOCK_FIELDS)
+    if len(header) != SUPER_BLOCK_DATA_LENGTH * NUM_SUPER_BLOCK_FIELDS:
+        raise RuntimeError(
+            f"file is too small, unable to read config {len(header)=}, matbe disk is corrupted."
+        )
+    block_size, inode_size, num_blocks, num_inodes = (
+        int.from_bytes(
+            header[offset : offset + SUPER_BLOCK_DATA_LENGTH],
+            byteorder="big",
+            signed=False,
+        )
+        for offset in range(0, len(header), SUPER_BLOCK_DATA_LENGTH)
     )
     if block_size < file.tell():
         raise RuntimeError(
@@ -46,23 +211,20 @@ def load_config_from_file(file: BinaryIO) -> Config:
 
 
 def dump_config(config: Config) -> bytes:
-    header = (
-        config.block_size.to_bytes(
-            length=SUPER_BLOCK_DATA_LENGTH, byteorder="big", signed=False
-        )
-        + config.inode_size.to_bytes(
-            length=SUPER_BLOCK_DATA_LENGTH, byteorder="big", signed=False
-        )
-        + config.num_blocks.to_bytes(
-            length=SUPER_BLOCK_DATA_LENGTH, byteorder="big", signed=False
-        )
-        + config.num_inodes.to_bytes(
+    header = bytearray(SUPER_BLOCK_DATA_LENGTH * NUM_SUPER_BLOCK_FIELDS)
+    fields = (
+        config.block_size,
+        config.inode_size,
+        config.num_blocks,
+        config.num_inodes,
+    )
+    for offset, value in zip(range(0, len(header), SUPER_BLOCK_DATA_LENGTH), fields):
+        header[offset : offset + SUPER_BLOCK_DATA_LENGTH] = value.to_bytes(
             length=SUPER_BLOCK_DATA_LENGTH, byteorder="big", signed=False
         )
-    )
     if config.block_size < len(header):
         raise RuntimeError(f"{config.block_size=} is too small try {len(header)=}.")
-    return header
+    return bytes(header)
 
 
 def dump_bitmap(bitmap: Bitmap) -> bytes:
@@ -74,38 +236,166 @@ class BitmapFile(Bitmap):
         self._size: int = size
         self.file: BinaryIO = file
         self.pos: int = pos
+        self._version: int = 0
+        self._popcount_cache: tuple[int, int] = (-1, 0)
+        # NOTE: indexes of bytes changed since the last flush, written back by flush/close
+        self._dirty: set[int] = set()
 
         self.size_bytes: int = ceil_division(size, 8)
+        self._set_data(bytearray(self.size_bytes))
+        self.reload()
+
+    def reload(self) -> None:
+        """Read the bitmap back from the file, dropping unflushed changes."""
         self.file.seek(self.pos, os.SEEK_SET)
-        self._data: bytearray = bytearray(file.read(self.size_bytes))
-        if len(self._data) != self.size_bytes:
+        if self.file.readinto(self._data) != self.size_bytes:  # type: ignore[attr-defined]
             raise RuntimeError(
                 f"file is too small, unable to read {self.size_bytes=} content, matbe disk is corrupted."
             )
+        self._dirty.clear()
+        self._version += 1
+
+    def _set_unchecked(self, index: int) -> None:
+        idx: int = index >> 3
+        self._data[idx] |= 1 << (index & 7)
+        self._version += 1
+        self._dirty.add(idx)
+
+    def _clear_unchecked(self, index: int) -> None:
+        idx: int = index >> 3
+        self._data[idx] &= ~(1 << (index & 7))
+        self._version += 1
+        self._dirty.add(idx)
+
+    def set_range(self, start: int, stop: int) -> None:
+        super().set_range(start, stop)
+        if start != stop:  # NOTE: the touched bytes are one run, written right away
+            self._write_run(start >> 3, ((stop - 1) >> 3) + 1)
+
+    def flush(self) -> None:
+        """Write the dirty bytes back to the file, one write per contiguous run."""
+        if not self._dirty:
+            return None
+        dirty: list[int] = sorted(self._dirty)
+        self._dirty.clear()
+        start = end = dirty[0]
+        for idx in dirty[1:]:
+            if idx != end + 1:
+                self._write_run(start, end + 1)
+                start = idx
+            end = idx
+        self._write_run(start, end + 1)
+
+    def close(self) -> None:
+        self.flush()
+
+    def _write_run(self, start: int, stop: int) -> None:
+        # NOTE: the whole run goes out in one call, on the encrypted disk that is one
+        # cipher seek + encrypt per run, the memoryview slice avoids copying the run first
+        pwrite(self.file, self.pos + start, memoryview(self._data)[start:stop])
+
 
-    def set(self, index: int):
-        if not (0 <= index < self._size):
-            raise IndexError("Bitmap index out of range")
-        idx: int = index // 8
-        self._data[idx] |= 1 << (index % 8)
-        self.file.seek(self.pos + idx, os.SEEK_SET)
-        self.file.write(self._data[idx : idx + 1])
-
-    def clear(self, index: int):
-        if not (0 <= index < self._size):
-            raise IndexError("Bitmap index out of range")
-        idx: int = index // 8
-        self._data[idx] &= ~(1 << (index % 8))
-        self.file.seek(self.pos + idx, os.SEEK_SET)
-        self.file.write(self._data[idx : idx + 1])
-
-
-class InodeView(protocol.InodeView):
-    def __init__(self, file: BinaryIO, data: bytes, pos: int) -> None:
+class MmapBitmapFile(BitmapFile):
+    """BitmapFile backed by a shared mmap of the bitmap region.
+
+    A bit flip is a plain memory store, the kernel writes the pages back so
+    there is no dirty tracking and no write per flush.
+    """
+
+    def __init__(self, size: int, file: BinaryIO, *, pos: int, fd: int):
+        self._size: int = size
         self.file: BinaryIO = file
         self.pos: int = pos
-        self.data: bytearray = bytearray(data)
-        self.inode_size: int = len(data)
+        self._version: int = 0
+        self._popcount_cache: tuple[int, int] = (-1, 0)
+        self._dirty: set[int] = set()  # NOTE: stays empty, kept for the BitmapFile api
+
+        self.size_bytes: int = ceil_division(size, 8)
+        # NOTE: mmap offset must be a multiple of ALLOCATIONGRANULARITY
+        offset: int = pos & ~(mmap.ALLOCATIONGRANULARITY - 1)
+        self._mm: mmap.mmap = mmap.mmap(
+            fd,
+            pos - offset + self.size_bytes,
+            flags=mmap.MAP_SHARED | MAP_POPULATE,
+            prot=mmap.PROT_READ | mmap.PROT_WRITE,
+            offset=offset,
+        )
+        data = memoryview(self._mm)[pos - offset :]
+        self._set_data(data)  # type: ignore[arg-type] # NOTE: bytearray like, same length api
+
+    _set_unchecked = Bitmap._set_unchecked
+    _clear_unchecked = Bitmap._clear_unchecked
+    set_range = Bitmap.set_range
+
+    def flush(self) -> None:
+        return None
+
+    def reload(self) -> None:
+        # NOTE: the shared mapping already shows the file, only cached state is dropped
+        self._version += 1
+
+    def close(self) -> None:
+        if self._mm.closed:
+            return None
+        self._data.release()  # type: ignore[attr-defined]
+        self._mm.flush()
+        self._mm.close()
+
+
+def open_bitmap(size: int, file: BinaryIO, *, pos: int) -> BitmapFile:
+    """mmap the bitmap region when the file has a descriptor, else read it into memory."""
+    fd: int | None = getattr(file, "_fd", None)
+    if fd is not None and os.fstat(fd).st_size >= pos + ceil_division(size, 8):
+        try:
+            return MmapBitmapFile(size, file, pos=pos, fd=fd)
+        except (OSError, ValueError):  # NOTE: eg. opened read only, fall back to read
+            pass
+    return BitmapFile(size, file, pos=pos)
+
+
+def read_exact(file: BinaryIO, pos: int, size: int) -> bytearray:
+    """Read exactly size bytes at absolute pos."""
+    file.seek(pos, os.SEEK_SET)
+    data = bytearray(size)
+    if (read := file.readinto(data)) != size:  # type: ignore[attr-defined]
+        raise RuntimeError(f"read {read=} but expeted {size=}.")
+    return data
+
+
+def read_many(file: BinaryIO, positions: Iterable[int], size: int) -> list[bytes]:
+    """Read size bytes at every absolute position, one positional read each."""
+    out: list[bytes] = []
+    seek, read = file.seek, file.read
+    for pos in positions:
+        seek(pos, os.SEEK_SET)
+        if len(data := read(size)) != size:
+            raise RuntimeError(f"read {len(data)=} but expeted {size=}.")
+        out.append(data)
+    return out
+
+
+class InodeView:
+    def __init__(
+        self,
+        file: BinaryIO,
+        pos: int,
+        inode_size: int,
+        write_at: Callable[[int, ByteString], int] | None = None,
+    ) -> None:
+        self.file: BinaryIO = file
+        self.pos: int = pos
+        self.inode_size: int = inode_size
+        self._write_at: Callable[[int, ByteString], int] = (
+            positional_writer(file) if write_at is None else write_at
+        )
+        # NOTE: read lazily on the first access, write only users never read the inode
+        self._data: bytearray | None = None
+
+    @property
+    def data(self) -> bytearray:
+        if self._data is None:
+            self._data = read_exact(self.file, self.pos, self.inode_size)
+        return self._data
 
     def __repr__(self) -> str:
         return self.data.__repr__()
@@ -113,16 +403,23 @@ class InodeView(protocol.InodeView):
     def __len__(self) -> int:
         return self.inode_size
 
-    def __setitem__(self, idx: "slice[None, None, None]", value: ByteString, /):
-        self.data[idx] = value
-        self.file.seek(self.pos, os.SEEK_SET)
-        self.file.write(value)
+    def __setitem__(
+        self, idx: "slice[int | None, int | None, None]", value: ByteString, /
+    ):
+        data = self._data
+        start = idx.start
+        if data is not None:
+            data[idx] = value
+        elif start is None and len(value) == self.inode_size:
+            self._data = bytearray(value)  # NOTE: whole inode is known, no read later
+        self._write_at(self.pos if start is None else self.pos + start, value)
 
-    def __getitem__(self, idx: "slice[int, int, None]", /) -> bytes:
-        return bytes(self.data[idx])
+    def __getitem__(self, idx: "slice[int, int, None]", /) -> memoryview:
+        # NOTE: zero copy like the in memory disk, slice assignments keep the size
+        return memoryview(self.data)[idx]
 
 
-class InodesList(protocol.InodesList):
+class InodesList:
     def __init__(
         self, file: BinaryIO, *, pos: int, inode_size: int, num_inodes: int
     ) -> None:
@@ -130,23 +427,62 @@ class InodesList(protocol.InodesList):
         self.pos: int = pos
         self.inode_size: int = inode_size
         self.num_inodes: int = num_inodes
+        self._base: int = pos
+        self._stride: int = inode_size
+        self._write_at: Callable[[int, ByteString], int] = positional_writer(file)
+        # NOTE: views write through to the file, so a cached view never goes stale
+        self._cache: OrderedDict[int, InodeView] = OrderedDict()
 
     def __getitem__(self, idx: int, /) -> InodeView:
-        if idx >= self.num_inodes or idx < 0:
+        cache = self._cache
+        if (view := cache.get(idx)) is not None:
+            cache.move_to_end(idx)
+            return view
+        if not 0 <= idx < self.num_inodes:
             raise IndexError(f"{idx=} out of range.")
-        pos = self.pos + idx * self.inode_size
-        self.file.seek(pos, os.SEEK_SET)
-        data: bytes = self.file.read(self.inode_size)
-        if len(data) != self.inode_size:
-            raise RuntimeError(f"read {len(data)=} but expeted {self.inode_size=}.")
-        return InodeView(self.file, data=data, pos=pos)
+        stride: int = self._stride
+        view = cache[idx] = InodeView(
+            self.file, self._base + idx * stride, stride, self._write_at
+        )
+        if len(cache) > INODE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return view
+
+    def read_many(self, idxs: Iterable[int]) -> list[bytes]:
+        """Raw bytes of many inodes for bulk scans, bypasses the view cache."""
+        idxs = list(idxs)
+        for idx in idxs:
+            if not 0 <= idx < self.num_inodes:
+                raise IndexError(f"{idx=} out of range.")
+        return read_many(
+            self.file,
+            (self.pos + idx * self.inode_size for idx in idxs),
+            self.inode_size,
+        )
 
 
-class BlockView(protocol.BlockView):
-    def __init__(self, file: BinaryIO, data: bytes, pos: int) -> None:
+class BlockView:
+    def __init__(
+        self,
+        file: BinaryIO,
+        pos: int,
+        block_size: int,
+        write_at: Callable[[int, ByteString], int] | None = None,
+    ) -> None:
         self.file: BinaryIO = file
         self.pos: int = pos
-        self.data: bytearray = bytearray(data)
+        self.block_size: int = block_size
+        self._write_at: Callable[[int, ByteString], int] = (
+            positional_writer(file) if write_at is None else write_at
+        )
+        # NOTE: read lazily on the first access, write only users never read the block
+        self._data: bytearray | None = None
+
+    @property
+    def data(self) -> bytearray:
+        if self._data is None:
+            self._data = read_exact(self.file, self.pos, self.block_size)
+        return self._data
 
     def __repr__(self) -> str:
         return self.data.__repr__()
@@ -154,33 +490,72 @@ class BlockView(protocol.BlockView):
     def __setitem__(
         self, idx: "slice[int | None, int | None, None]", value: ByteString, /
     ):
-        self.data[idx] = value
-        pos = self.pos + (0 if idx.start is None else idx.start)
-        self.file.seek(pos, os.SEEK_SET)
-        self.file.write(value)
+        data = self._data
+        if data is not None:
+            data[idx] = value
+        start = idx.start
+        self._write_at(self.pos if start is None else self.pos + start, value)
 
     def __iter__(self) -> Iterator[int]:
-        yield from self.data
+        return iter(self.data)  # NOTE: C level iterator, no generator frame per byte
+
+    def tobytes(self) -> bytes:
+        return bytes(self.data)
+
+    def as_memoryview(self) -> memoryview:
+        return memoryview(self.data)
 
-    def __getitem__(self, idx: "slice[int | None, int | None, None]", /) -> bytes:
-        return bytes(self.data[idx])
+    def __getitem__(
+        self, idx: "slice[int | None, int | None, None]", /
+    ) -> memoryview:
+        # NOTE: zero copy like the in memory disk, slice assignments keep the size
+        return memoryview(self.data)[idx]
 
 
-class BlocksList(protocol.BlocksList):
+class BlocksList:
     def __init__(self, file: BinaryIO, *, block_size: int, num_blocks: int) -> None:
         self.file: BinaryIO = file
         self.block_size: int = block_size
         self.num_blocks: int = num_blocks
+        # NOTE: block positions are absolute, block 0 starts the file
+        self._base: int = 0
+        self._stride: int = block_size
+        self._write_at: Callable[[int, ByteString], int] = positional_writer(file)
+        self._cache: OrderedDict[int, BlockView] = OrderedDict()
 
     def __getitem__(self, idx: int, /) -> BlockView:
-        if idx >= self.num_blocks or idx < 0:
+        cache = self._cache
+        if (view := cache.get(idx)) is not None:
+            cache.move_to_end(idx)
+            return view
+        if not 0 <= idx < self.num_blocks:
             raise IndexError(f"{idx=} out of range.")
-        pos = idx * self.block_size
-        self.file.seek(pos, os.SEEK_SET)
-        data: bytes = self.file.read(self.block_size)
-        if len(data) != self.block_size:
-            raise RuntimeError(f"read {len(data)=} but expeted {self.block_size=}.")
-        return BlockView(self.file, data=data, pos=pos)
+        stride: int = self._stride
+        view = cache[idx] = BlockView(
+            self.file, self._base + idx * stride, stride, self._write_at
+        )
+        if len(cache) > BLOCK_CACHE_SIZE:
+            cache.popitem(last=False)
+        return view
+
+    def read_run(self, idx: int, count: int, /) -> bytearray:
+        """Consecutive blocks with one positional read, bypasses the view cache."""
+        # NOTE: views write through to the file, so the file is never behind the cache
+        if idx < 0 or count < 0 or idx + count > self.num_blocks:
+            raise IndexError(f"{idx=} {count=} out of range.")
+        return read_exact(
+            self.file, self._base + idx * self._stride, count * self._stride
+        )
+
+    def read_many(self, idxs: Iterable[int]) -> list[bytes]:
+        """Raw bytes of many blocks for bulk scans, bypasses the view cache."""
+        idxs = list(idxs)
+        for idx in idxs:
+            if not 0 <= idx < self.num_blocks:
+                raise IndexError(f"{idx=} out of range.")
+        return read_many(
+            self.file, (idx * self.block_size for idx in idxs), self.block_size
+        )
 
 
 class InFileDisk(BaseDisk):
@@ -192,9 +567,11 @@ class InFileDisk(BaseDisk):
         if isinstance(filepath, str):
             if not os.path.exists(filepath):
                 raise FileNotFoundError(f"{filepath=} not exists.")
-            self.file = open(filepath, "rb+")
+            self.file = PositionTrackingFile(
+                open(filepath, "rb+", buffering=FILE_BUFFERING)
+            )
         else:
-            self.file = filepath
+            self.file = PositionTrackingFile(filepath)
         self._closed: bool = False
 
         try:
@@ -217,10 +594,10 @@ class InFileDisk(BaseDisk):
 
         len_config_bytes: int = self.file.tell()
 
-        self.inodes_bitmap = BitmapFile(
+        self.inodes_bitmap = open_bitmap(
             self.config.num_inodes, self.file, pos=len_config_bytes
         )
-        self.blocks_bitmap = BitmapFile(
+        self.blocks_bitmap = open_bitmap(
             self.config.num_blocks,
             self.file,
             pos=len_config_bytes + self.inodes_bitmap.size_bytes,
@@ -293,9 +670,11 @@ class InFileDisk(BaseDisk):
         if isinstance(filepath, str):
             if os.path.exists(filepath):
                 raise FileExistsError(f"{filepath=} already exists.")
-            self.file = open(filepath, "wb+")
+            self.file = PositionTrackingFile(
+                open(filepath, "wb+", buffering=FILE_BUFFERING)
+            )
         else:
-            self.file = filepath
+            self.file = PositionTrackingFile(filepath)
         self._closed = False
         self.file.write(
             InFileDiskType.NON_ENCRYPTED.value.to_bytes(
@@ -305,13 +684,13 @@ class InFileDisk(BaseDisk):
         self.file.write(config_bytes)
         len_config_bytes: int = self.file.tell()
 
-        self.file.seek(disk_size - 1, os.SEEK_SET)
-        self.file.write(NULL_BYTES)  # NOTE: created file with config...
+        # NOTE: created file with config..., sparse when the file has a descriptor
+        self.file.extend_to(disk_size)  # type: ignore[attr-defined]
 
-        self.inodes_bitmap = BitmapFile(
+        self.inodes_bitmap = open_bitmap(
             config.num_inodes, self.file, pos=len_config_bytes
         )
-        self.blocks_bitmap = BitmapFile(
+        self.blocks_bitmap = open_bitmap(
             config.num_blocks,
             self.file,
             pos=len_config_bytes + self.inodes_bitmap.size_bytes,
@@ -337,8 +716,7 @@ class InFileDisk(BaseDisk):
             raise RuntimeError(
                 f"Something went wrong, {num_super_blocks=} should not be zero."
             )
-        for i in range(num_super_blocks):
-            self.blocks_bitmap.set(i)  # for super blocks
+        self.blocks_bitmap.set_range(0, num_super_blocks)  # for super blocks
 
         self.inodes = InodesList(
             self.file,
@@ -359,6 +737,9 @@ class InFileDisk(BaseDisk):
         self.inodes[0][:] = root_inode.to_bytes(config)
         self.inodes_bitmap.set(0)  # for root
 
+        self.inodes_bitmap.flush()
+        self.blocks_bitmap.flush()
+
         return self
 
     def total_space(self) -> int:
@@ -373,6 +754,12 @@ class InFileDisk(BaseDisk):
     def reserved_space(self) -> int:
         return self._reserved_space
 
+    def flush(self) -> None:
+        # NOTE: BitmapFile keeps bit flips in memory, they must reach the file before
+        # an inode pointing at the allocation does or a crash frees used blocks
+        self.inodes_bitmap.flush()
+        self.blocks_bitmap.flush()
+
     @property
     def closed(self) -> bool:
         return self._closed
@@ -381,6 +768,8 @@ class InFileDisk(BaseDisk):
         if self._closed:
             return None
         self._closed = True
+        self.inodes_bitmap.close()
+        self.blocks_bitmap.close()
         self.file.close()
 
     def __enter__(self) -> Self:
@@ -3,6 +3,7 @@ from io import BytesIO
 from types import TracebackType
 from typing import BinaryIO, ByteString, Self
 
+from ..bitmap import Bitmap
 from ..config import Config
 
 from .crypto import (
@@ -14,6 +15,7 @@ from .crypto import (
 )
 from .infile import (
     NULL_BYTES,
+    FILE_BUFFERING,
     BitmapFile,
     BlocksList,
     Directory,
@@ -22,14 +24,18 @@ from .infile import (
     Inode,
     InodeMode,
     InodesList,
+    PositionTrackingFile,
     ceil_division,
     dump_config,
     load_config_from_file,
 )
 
 # NOTE: any other type of disk must have first bit not equal to zero as for raw infile disk first bit is NULL
+# NOTE: bytes of zeros encrypted per write while a new disk is filled
+ZERO_FILL_CHUNK_SIZE: int = 1024 * 1024
 
 
+# NOTE: this wrapper does not buffer, the only buffer is the one of the underlying file
 class EncryptedBytesIOWrapper(BytesIO):
     def __init__(
         self,
@@ -45,6 +51,11 @@ class EncryptedBytesIOWrapper(BytesIO):
         self._closed: bool = False
         self._gap_size: int = 0
 
+        # NOTE: the end of file is probed once here and then tracked by seek/write/truncate
+        pos: int = file.tell()
+        self._known_end: int = file.seek(0, os.SEEK_END)
+        file.seek(pos, os.SEEK_SET)
+
     @property
     def closed(self) -> bool:
         return self._closed or self.file.closed
@@ -62,7 +73,8 @@ class EncryptedBytesIOWrapper(BytesIO):
         return self.file.tell()
 
     def truncate(self, size: int | None = None) -> int:
-        return self.file.truncate(size)
+        self._known_end = self.file.truncate(size)
+        return self._known_end
 
     def flush(self) -> None:
         self.file.flush()
@@ -76,7 +88,9 @@ class EncryptedBytesIOWrapper(BytesIO):
         return self.file.read(size)
 
     def _write_raw(self, buffer: ByteString) -> int:
-        return self.file.write(buffer)
+        result: int = self.file.write(buffer)
+        self._known_end = max(self._known_end, self.file.tell())
+        return result
 
     def read(self, size: int = -1) -> ByteString:  # type: ignore[override]
         pos: int = self.file.tell()
@@ -84,15 +98,24 @@ class EncryptedBytesIOWrapper(BytesIO):
         self.decryptor.seek(pos)
         return self.decryptor.decrypt(data)
 
-    def seek(self, pos: int, whence: int = 0) -> int:
-        self.file.seek(0, os.SEEK_END)
-        end_pos: int = self.file.tell()
+    def readinto(self, buffer: "bytearray | memoryview", /) -> int:  # type: ignore[override]
+        data: ByteString = self.read(len(buffer))
+        size: int = len(data)
+        buffer[:size] = data
+        return size
 
-        result: int = self.file.seek(pos, whence)
+    def seek(self, pos: int, whence: int = 0) -> int:
+        if whence == os.SEEK_CUR:
+            pos += self.file.tell()
+        elif whence == os.SEEK_END:
+            pos += self._known_end
+        elif whence != os.SEEK_SET:
+            raise ValueError(f"invalid {whence=}")
 
-        cur: int = self.file.tell()
+        result: int = self.file.seek(pos, os.SEEK_SET)
 
-        self._gap_size = max(0, cur - end_pos)  # remember gap beyond EOF (if any)
+        # remember gap beyond EOF (if any)
+        self._gap_size = max(0, result - self._known_end)
 
         return result
 
@@ -109,7 +132,26 @@ class EncryptedBytesIOWrapper(BytesIO):
         else:
             self.encryptor.seek(pos)
         data: ByteString = self.encryptor.encrypt(buffer)
-        return self.file.write(data)
+        result = self.file.write(data)
+        self._known_end = max(self._known_end, self.file.tell())
+        return result
+
+    def _extend_raw_to(self, size: int) -> None:
+        self.file.extend_to(size)  # type: ignore[attr-defined]
+        self._known_end = max(self._known_end, size)
+
+    def pwrite(self, pos: int, buffer: ByteString) -> int:
+        """Encrypt and write buffer at absolute pos, a single seek when pos is inside the file."""
+        if pos > self._known_end:  # NOTE: the gap before pos must be filled first
+            self.seek(pos, os.SEEK_SET)
+            return self.write(buffer)
+        self.encryptor.seek(pos)
+        data: ByteString = self.encryptor.encrypt(buffer)
+        self.file.seek(pos, os.SEEK_SET)
+        result: int = self.file.write(data)
+        self._gap_size = 0
+        self._known_end = max(self._known_end, pos + result)
+        return result
 
     def __enter__(self) -> Self:
         if self.closed:
@@ -130,9 +172,11 @@ class InFileChaCha20EncryptedDisk(InFileDisk):
         if isinstance(filepath, str):
             if not os.path.exists(filepath):
                 raise FileNotFoundError(f"{filepath=} not exists.")
-            self.file = open(filepath, "rb+")
+            self.file = PositionTrackingFile(
+                open(filepath, "rb+", buffering=FILE_BUFFERING)
+            )
         else:
-            self.file = filepath
+            self.file = PositionTrackingFile(filepath)
         self._closed: bool = False
 
         try:
@@ -234,8 +278,19 @@ class InFileChaCha20EncryptedDisk(InFileDisk):
 
     @classmethod
     def new_disk(
-        cls, filepath: str | BinaryIO, config: Config, password: bytes | None = None
+        cls,
+        filepath: str | BinaryIO,
+        config: Config,
+        password: bytes | None = None,
+        *,
+        sparse: bool = False,
     ) -> Self:
+        """Create an encrypted disk, the whole disk is written as ciphertext of zeros.
+
+        With sparse=True only the header is encrypted and the data blocks are left as
+        a sparse plaintext zero fill, faster to create but anyone holding the file can
+        tell which blocks were ever written.
+        """
         if password is None:
             raise ValueError(f"{password=} must not be None.")
         disk_size = config.disk_size
@@ -266,11 +321,19 @@ class InFileChaCha20EncryptedDisk(InFileDisk):
             if os.path.exists(filepath):
                 raise FileExistsError(f"{filepath=} already exists.")
             self.file = EncryptedBytesIOWrapper(
-                encryptor, decryptor, file=open(filepath, "wb+"), auto_close=True
+                encryptor,
+                decryptor,
+                file=PositionTrackingFile(
+                    open(filepath, "wb+", buffering=FILE_BUFFERING)
+                ),
+                auto_close=True,
             )
         else:
             self.file = EncryptedBytesIOWrapper(
-                encryptor, decryptor, file=filepath, auto_close=True
+                encryptor,
+                decryptor,
+                file=PositionTrackingFile(filepath),
+                auto_close=True,
             )
         self._closed = False
         self.file._write_raw(
@@ -283,22 +346,10 @@ class InFileChaCha20EncryptedDisk(InFileDisk):
         self.file.write(config_bytes)
         len_config_bytes: int = self.file.tell()
 
-        self.file.seek(disk_size - 1, os.SEEK_SET)
-        self.file.write(NULL_BYTES)  # NOTE: created file with config...
-
-        self.inodes_bitmap = BitmapFile(
-            config.num_inodes, self.file, pos=len_config_bytes
-        )
-        self.blocks_bitmap = BitmapFile(
-            config.num_blocks,
-            self.file,
-            pos=len_config_bytes + self.inodes_bitmap.size_bytes,
-        )
-
+        inodes_bitmap_size: int = ceil_division(config.num_inodes, 8)
+        blocks_bitmap_size: int = ceil_division(config.num_blocks, 8)
         header_prefix_size_required: int = (
-            len_config_bytes
-            + self.inodes_bitmap.size_bytes
-            + self.blocks_bitmap.size_bytes
+            len_config_bytes + inodes_bitmap_size + blocks_bitmap_size
         )
         header_size_required: int = (
             header_prefix_size_required + config.inode_size * config.num_inodes
@@ -315,8 +366,32 @@ class InFileChaCha20EncryptedDisk(InFileDisk):
             raise RuntimeError(
                 f"Something went wrong, {num_super_blocks=} should not be zero."
             )
-        for i in range(num_super_blocks):
-            self.blocks_bitmap.set(i)  # for super blocks
+
+        # NOTE: the whole plaintext header, super block bits already set, is one encrypt + write
+        super_blocks = Bitmap(config.num_blocks)
+        super_blocks.set_range(0, num_super_blocks)  # for super blocks
+        header = bytearray(header_size_required - len_config_bytes)
+        header[inodes_bitmap_size : inodes_bitmap_size + blocks_bitmap_size] = (
+            super_blocks._data
+        )
+        self.file.pwrite(len_config_bytes, header)
+        if sparse:
+            # NOTE: plain zeros, not ciphertext, only the header must read back as zeros
+            self.file._extend_raw_to(disk_size)
+        else:
+            # NOTE: encrypted in chunks, one shared zero chunk instead of a disk sized buffer
+            zeros = bytes(min(ZERO_FILL_CHUNK_SIZE, disk_size))
+            for pos in range(header_size_required, disk_size, len(zeros)):
+                self.file.pwrite(pos, zeros[: disk_size - pos])
+
+        self.inodes_bitmap = BitmapFile(
+            config.num_inodes, self.file, pos=len_config_bytes
+        )
+        self.blocks_bitmap = BitmapFile(
+            config.num_blocks,
+            self.file,
+            pos=len_config_bytes + inodes_bitmap_size,
+        )
 
         self.inodes = InodesList(
             self.file,
@@ -337,4 +412,7 @@ class InFileChaCha20EncryptedDisk(InFileDisk):
         self.inodes[0][:] = root_inode.to_bytes(config)
         self.inodes_bitmap.set(0)  # for root
 
+        self.inodes_bitmap.flush()
+        self.blocks_bitmap.flush()
+
         return self
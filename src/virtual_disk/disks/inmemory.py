@@ -8,6 +8,31 @@ from ..path import Directory
 from . import BaseDisk
 
 
+class MemoryViewList:
+    """Fixed size slots laid out back to back in one bytearray, each item is a memoryview of its slot."""
+
+    def __init__(self, *, item_size: int, num_items: int) -> None:
+        self.item_size: int = item_size
+        self.num_items: int = num_items
+        self._buffer: bytearray = bytearray(item_size * num_items)
+        self._view: memoryview = memoryview(self._buffer)
+
+    def __len__(self) -> int:
+        return self.num_items
+
+    def __getitem__(self, idx: int, /) -> memoryview:
+        if idx >= self.num_items or idx < 0:
+            raise IndexError(f"{idx=} out of range.")
+        start: int = idx * self.item_size
+        return self._view[start : start + self.item_size]
+
+    def read_run(self, idx: int, count: int, /) -> memoryview:
+        """count consecutive slots starting at idx as one zero copy view."""
+        if idx < 0 or count < 0 or idx + count > self.num_items:
+            raise IndexError(f"{idx=} {count=} out of range.")
+        return self._view[idx * self.item_size : (idx + count) * self.item_size]
+
+
 class InMemoryDisk(BaseDisk):
     def __init__(self, config: Config) -> None:
         self._closed: bool = False
@@ -20,7 +45,10 @@ class InMemoryDisk(BaseDisk):
 
         self.config: Config = config
 
-        self.blocks = [bytearray(config.block_size) for _ in range(config.num_blocks)]
+        # NOTE: one allocation for every block instead of one bytearray per block
+        self.blocks = MemoryViewList(
+            item_size=config.block_size, num_items=config.num_blocks
+        )
 
         self.blocks_bitmap: Bitmap = Bitmap(config.num_blocks)
 
@@ -28,7 +56,9 @@ class InMemoryDisk(BaseDisk):
             0
         )  # NOTE/TODO: reserved for super block as also can't have pointer, null_ptr
 
-        self.inodes = [bytearray(config.inode_size) for _ in range(config.num_inodes)]
+        self.inodes = MemoryViewList(
+            item_size=config.inode_size, num_items=config.num_inodes
+        )
         self.inodes_bitmap: Bitmap = Bitmap(config.num_inodes)
 
         self.root = Directory.new(
@@ -49,6 +79,9 @@ class InMemoryDisk(BaseDisk):
     def reserved_space(self) -> int:
         return self.config.block_size  # NOTE: we are storing inodes separately.
 
+    def flush(self) -> None:
+        return None  # NOTE: the bitmaps are the storage, nothing is pending
+
     @property
     def closed(self) -> bool:
         return self._closed
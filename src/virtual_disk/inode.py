@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from itertools import islice
-from typing import ByteString, Iterable, Self
+from itertools import islice, repeat
+from struct import Struct
+from typing import ByteString, Callable, Iterable, Iterator, Self
 
 from .config import Config
 from .constants import (
@@ -11,8 +12,25 @@ from .constants import (
     NUM_DIRECT_PTR,
     TYPE_NULL_PTR,
 )
-from .protocol import BlockView, Disk, InodeView
-from .utils import ceil_division, current_time_epoch
+from .protocol import BlocksList, BlockView, Disk, InodeView
+from .utils import NATIVE_INT_CODES, ceil_division, current_time_epoch
+
+
+def iter_addrs(data: ByteString, config: Config) -> Iterator[int]:
+    """Decode the block addresses of a whole indirect block."""
+    # NOTE: the whole block is unpacked by one C call, for native widths that is
+    # the int tuple itself, other widths still need int.from_bytes per address
+    unpacked = config.block_addrs_struct.unpack_from(data)
+    if config.block_addr_length in NATIVE_INT_CODES:
+        return iter(unpacked)
+    return map(int.from_bytes, unpacked)
+
+
+def count_addrs(data: ByteString, address_length: int) -> int:
+    """Number of block addresses in use in data, they always fill a prefix."""
+    # NOTE: no address is NULL_PTR before the last used one, so the used prefix
+    # ends at the last non NULL byte, found by one C level rstrip
+    return ceil_division(len(bytes(data).rstrip(NULL_BYTES)), address_length)
 
 
 class InodeMode(Enum):
@@ -21,14 +39,33 @@ class InodeMode(Enum):
     # SYMBOLIC_LINK = auto()
 
 
-@dataclass(frozen=False)
+def peek_mode(data: InodeView) -> InodeMode:
+    """st_mode of the serialized inode data, without parsing the inode."""
+    # NOTE: st_mode is the leading byte of the inode layout (">B" of inode_struct)
+    return InodeMode(data[0:1][0])
+
+
+def is_directory(data: InodeView) -> bool:
+    """Whether the serialized inode data is a directory, without parsing the inode."""
+    return data[0:1][0] == InodeMode.DIRECTORY.value
+
+
+def write_mtime(data: InodeView, st_mtime: int, config: Config) -> None:
+    """Overwrite only the st_mtime field of the serialized inode data."""
+    # NOTE: st_mtime follows the ">B" st_mode and the st_size field of inode_struct
+    start: int = 1 + config.max_file_size_length
+    data[start : start + EPOCH_TIME_BYTES] = st_mtime.to_bytes(EPOCH_TIME_BYTES)
+
+
+# NOTE: slotted, a fixed field layout without a per instance __dict__
+@dataclass(frozen=False, slots=True)
 class Inode:
     st_mode: InodeMode
     st_size: int = 0
     st_mtime: int = field(default_factory=current_time_epoch)  # Modification time
     st_ctime: int = field(default_factory=current_time_epoch)  # Metadata change
     directs: list[int | TYPE_NULL_PTR] = field(
-        default_factory=lambda: list([NULL_PTR] * NUM_DIRECT_PTR)
+        default_factory=lambda: [NULL_PTR] * NUM_DIRECT_PTR
     )
     indirect: int | TYPE_NULL_PTR = NULL_PTR  # pointer to block of block pointers
     double_indirect: int | TYPE_NULL_PTR = (
@@ -45,49 +82,20 @@ class Inode:
 
         address_length: int = config.block_addr_length
         max_file_size_length: int = config.max_file_size_length
+        layout: Struct = config.inode_struct
 
-        offset: int = 0
-        st_mode = int.from_bytes(
-            data[offset : offset + 1], byteorder="big", signed=False
-        )
-        offset += 1
-        st_size = int.from_bytes(
-            data[offset : offset + max_file_size_length], byteorder="big", signed=False
+        # NOTE: one C level unpack, only the non native widths go through int.from_bytes
+        st_mode, st_size, st_mtime, st_ctime, *ptrs = layout.unpack_from(
+            data[0 : layout.size]
         )
-        offset += max_file_size_length
-        st_mtime = int.from_bytes(
-            data[offset : offset + EPOCH_TIME_BYTES], byteorder="big", signed=False
-        )
-        offset += EPOCH_TIME_BYTES
-        st_ctime = int.from_bytes(
-            data[offset : offset + EPOCH_TIME_BYTES], byteorder="big", signed=False
-        )
-        offset += EPOCH_TIME_BYTES
-        directs = [
-            int.from_bytes(
-                data[
-                    offset + i * address_length : offset
-                    + i * address_length
-                    + address_length
-                ],
-                byteorder="big",
-                signed=False,
-            )
-            for i in range(NUM_DIRECT_PTR)
-        ]
-        offset += NUM_DIRECT_PTR * address_length
-        indirect = int.from_bytes(
-            data[offset : offset + address_length], byteorder="big", signed=False
-        )
-        offset += address_length
-        double_indirect = int.from_bytes(
-            data[offset : offset + address_length], byteorder="big", signed=False
-        )
-        offset += address_length
-        triple_indirect = int.from_bytes(
-            data[offset : offset + address_length], byteorder="big", signed=False
-        )
-        # offset += NUM_DIRECT_PTR * address_length
+        if max_file_size_length not in NATIVE_INT_CODES:
+            st_size = int.from_bytes(st_size)
+        if EPOCH_TIME_BYTES not in NATIVE_INT_CODES:
+            st_mtime, st_ctime = int.from_bytes(st_mtime), int.from_bytes(st_ctime)
+        if address_length not in NATIVE_INT_CODES:
+            ptrs = list(map(int.from_bytes, ptrs))
+        directs = ptrs[:NUM_DIRECT_PTR]
+        indirect, double_indirect, triple_indirect = ptrs[NUM_DIRECT_PTR:]
         return cls(
             InodeMode(st_mode),
             st_size,
@@ -102,37 +110,28 @@ class Inode:
     def to_bytes(self, config: Config) -> bytes:
         address_length: int = config.block_addr_length
         max_file_size_length: int = config.max_file_size_length
-
-        header = (
-            self.st_mode.value.to_bytes(length=1, byteorder="big", signed=False)
-            + self.st_size.to_bytes(
-                length=max_file_size_length, byteorder="big", signed=False
-            )
-            + self.st_mtime.to_bytes(
-                length=EPOCH_TIME_BYTES, byteorder="big", signed=False
-            )
-            + self.st_ctime.to_bytes(
-                length=EPOCH_TIME_BYTES, byteorder="big", signed=False
-            )
-        )
-        data = header + (
-            b"".join(
-                direct.to_bytes(length=address_length, byteorder="big", signed=False)
-                for direct in self.directs
-            )
-            + self.indirect.to_bytes(
-                length=address_length, byteorder="big", signed=False
-            )
-            + self.double_indirect.to_bytes(
-                length=address_length, byteorder="big", signed=False
-            )
-            + self.triple_indirect.to_bytes(
-                length=address_length, byteorder="big", signed=False
-            )
-        )
-        return data + NULL_BYTES * (
-            config.inode_size - len(data)  # -ve means b''
+        layout: Struct = config.inode_struct
+
+        st_size: int | bytes = self.st_size
+        st_mtime: int | bytes = self.st_mtime
+        st_ctime: int | bytes = self.st_ctime
+        addrs: tuple[int, ...] = (
+            *self.directs,
+            self.indirect,
+            self.double_indirect,
+            self.triple_indirect,
         )
+        ptrs: Iterable[int | bytes] = addrs
+        if max_file_size_length not in NATIVE_INT_CODES:
+            st_size = self.st_size.to_bytes(max_file_size_length)
+        if EPOCH_TIME_BYTES not in NATIVE_INT_CODES:
+            st_mtime = self.st_mtime.to_bytes(EPOCH_TIME_BYTES)
+            st_ctime = self.st_ctime.to_bytes(EPOCH_TIME_BYTES)
+        if address_length not in NATIVE_INT_CODES:
+            ptrs = map(int.to_bytes, addrs, repeat(address_length))
+
+        # NOTE: the layout ends with the pad bytes, one pack allocates the whole inode
+        return layout.pack(self.st_mode.value, st_size, st_mtime, st_ctime, *ptrs)
 
 
 class InodeIO:
@@ -145,7 +144,6 @@ class InodeIO:
         """Read up to n bytes starting at pos. If n==-1, read to EOF."""
         inode: Inode = self.inode
         disk: Disk = self.disk
-        config: Config = disk.config
 
         if pos < 0:
             raise ValueError("negative read position")
@@ -157,26 +155,75 @@ class InodeIO:
         else:
             n = min(n, inode.st_size - pos)
 
-        start_block_idx, start_block_off = divmod(pos, config.block_size)
-        end_block_idx, end_block_off = divmod(pos + n, config.block_size)
-        out = bytearray()
-        blocks = islice(
-            self.iteritem(), start_block_idx, end_block_idx + bool(end_block_off)
-        )
-        try:
-            start_block = disk.blocks[next(blocks)]
-        except StopIteration:
-            raise RuntimeError("Something went wrong...")
-        out.extend(start_block[start_block_off:])
+        block_size: int = disk.config.block_size
+        start_block_idx, start_block_off = divmod(pos, block_size)
+        if start_block_off + n <= block_size:
+            # NOTE: inside one block, getitem seeks to it without setting up a walk; an
+            # unallocated block (NULL_PTR) is left to readinto, never read as block 0
+            block_ptr = self.getitem(start_block_idx)
+            if block_ptr != NULL_PTR:
+                block = disk.blocks[block_ptr]
+                return bytes(block[start_block_off : start_block_off + n])
+        out = bytearray(n)
+        self.readinto(out, pos)
+        return bytes(out)
+
+    def readinto(self, buffer: "bytearray | memoryview", pos: int) -> int:
+        """Read up to len(buffer) bytes starting at pos into buffer. Returns number of bytes read."""
+        inode: Inode = self.inode
+        disk: Disk = self.disk
+        config: Config = disk.config
 
-        for block_ptr in blocks:
-            out.extend(disk.blocks[block_ptr])
+        if pos < 0:
+            raise ValueError("negative read position")
+        n: int = min(len(buffer), inode.st_size - pos)
+        if n <= 0:
+            return 0
 
-        if len(out) < n:
+        # NOTE: filled in place by slice assignment, no intermediate buffer
+        out = memoryview(buffer)
+        block_size: int = config.block_size
+        start_block_idx, start_block_off = divmod(pos, block_size)
+        end_block_idx, end_block_off = divmod(pos + n, block_size)
+        blocks: BlocksList = disk.blocks
+        ptrs = islice(
+            self._walk_from(start_block_idx),
+            end_block_idx + bool(end_block_off) - start_block_idx,
+        )
+        written: int = 0
+        block_off: int = start_block_off
+
+        def copy_run(run_start: int, run_len: int) -> None:
+            nonlocal written, block_off
+            to_read = min(run_len * block_size - block_off, n - written)
+            if run_len == 1:
+                data: ByteString = blocks[run_start][block_off : block_off + to_read]
+            else:
+                data = memoryview(blocks.read_run(run_start, run_len))[
+                    block_off : block_off + to_read
+                ]
+            out[written : written + to_read] = data
+            written += to_read
+            block_off = 0
+
+        # NOTE: physically consecutive blocks are copied as one run, one read per run
+        run_start: int = NULL_PTR
+        run_len: int = 0
+        for block_ptr in ptrs:
+            if run_len and block_ptr == run_start + run_len:
+                run_len += 1
+                continue
+            if run_len:
+                copy_run(run_start, run_len)
+            run_start, run_len = block_ptr, 1
+        if run_len:
+            copy_run(run_start, run_len)
+
+        if written < n:
             raise RuntimeError(
-                f"Something went wrong, {len(out)=} {self.inode.st_mode=} {self.inode.st_size=}."
+                f"Something went wrong, {written=} {self.inode.st_mode=} {self.inode.st_size=}."
             )
-        return bytes(out[:n])
+        return n
 
     def write_at(self, pos: int, data: ByteString) -> int:
         """Write data starting at pos. Returns number of bytes written."""
@@ -187,27 +234,42 @@ class InodeIO:
         if pos < 0:
             raise ValueError("negative write position")
         if pos > inode.st_size:
-            # NOTE: as block may not be empty, may have garbage data so please fill with NULL_BYTES
-            self.write_at(inode.st_size, NULL_BYTES * (pos - inode.st_size))
+            self._extend_to(pos)
         if not data:
             return 0
+        # NOTE: slices of a memoryview are zero copy, blocks are assigned straight from data
+        view = memoryview(data)
 
         start_block_idx, start_block_off = divmod(pos, config.block_size)
 
         remaining: int = len(data)
         src_off: int = 0
 
+        if (
+            start_block_off + remaining <= config.block_size
+            and start_block_idx * config.block_size < inode.st_size
+        ):
+            # NOTE: inside one already allocated block, getitem seeks to it without a walk;
+            # NULL_PTR falls through to the walk and allocation below, never to block 0
+            block_ptr = self.getitem(start_block_idx)
+            if block_ptr != NULL_PTR:
+                block = disk.blocks[block_ptr]
+                block[start_block_off : start_block_off + remaining] = view
+                if pos + remaining > inode.st_size:
+                    inode.st_size = pos + remaining
+                return remaining
+
         try:
-            blocks = islice(self.iteritem(), start_block_idx, None)
+            blocks = self._walk_from(start_block_idx)
             to_write = min(config.block_size - start_block_off, remaining)
             start_block = disk.blocks[next(blocks)]
-            start_block[start_block_off : start_block_off + to_write] = data[:to_write]
+            start_block[start_block_off : start_block_off + to_write] = view[:to_write]
             src_off += to_write
             remaining -= to_write
             while remaining > 0:
                 to_write = min(config.block_size, remaining)
                 block = disk.blocks[next(blocks)]
-                block[:to_write] = data[src_off : src_off + to_write]
+                block[:to_write] = view[src_off : src_off + to_write]
                 src_off += to_write
                 remaining -= to_write
         except StopIteration:
@@ -218,7 +280,7 @@ class InodeIO:
             to_write = min(config.block_size, remaining)
             block_ptr = self._allocate_block(st_size=pos + src_off)
             block = disk.blocks[block_ptr]
-            block[:to_write] = data[src_off : src_off + to_write]
+            block[:to_write] = view[src_off : src_off + to_write]
             src_off += to_write
             remaining -= to_write
 
@@ -229,74 +291,15 @@ class InodeIO:
         return len(data)
 
     def iteritem(self) -> Iterable[int]:
-        inode: Inode = self.inode
-        disk: Disk = self.disk
-        config: Config = disk.config
-
-        # |--------------------------- DIRECT ---------------------------|
-        for direct in inode.directs:
-            if direct == NULL_PTR:
-                return None
-            yield direct
-
-        # |--------------------------- INDIRECT ---------------------------|
-        if inode.indirect == NULL_PTR:
-            return None
-
-        def iter_ptr_from_indirect_recursive(
-            indirect: int | TYPE_NULL_PTR, recursive_depth: int = 1
-        ) -> Iterable[int]:
-            if indirect == NULL_PTR:
-                return None
-            if recursive_depth <= 0:
-                raise ValueError(f"{recursive_depth=} must be positive.")
-            data: BlockView
-            off: int
-            if recursive_depth == 1:
-                data = disk.blocks[indirect]
-                for idx in range(config.num_inode_addr_per_block):
-                    off = idx * config.block_addr_length
-                    ptr = int.from_bytes(
-                        data[off : off + config.block_addr_length],
-                        byteorder="big",
-                        signed=False,
-                    )
-                    if ptr == NULL_PTR:
-                        return None
-                    yield ptr
-                return None
-            data = disk.blocks[indirect]
-            for idx in range(config.num_inode_addr_per_block):
-                off = idx * config.block_addr_length
-                child_ptr: int | TYPE_NULL_PTR = int.from_bytes(
-                    data[off : off + config.block_addr_length],
-                    byteorder="big",
-                    signed=False,
-                )
-                yield from iter_ptr_from_indirect_recursive(
-                    indirect=child_ptr, recursive_depth=recursive_depth - 1
-                )
-
-        yield from iter_ptr_from_indirect_recursive(inode.indirect, recursive_depth=1)
-
-        # |--------------------------- DOUBLE INDIRECT ---------------------------|
-        if inode.double_indirect == NULL_PTR:
-            return None
-        yield from iter_ptr_from_indirect_recursive(
-            inode.double_indirect, recursive_depth=2
-        )
-
-        # |--------------------------- TRIPLE INDIRECT ---------------------------|
-        if inode.triple_indirect == NULL_PTR:
-            return None
-        yield from iter_ptr_from_indirect_recursive(
-            inode.triple_indirect, recursive_depth=3
-        )
+        return self._walk_from(0)
 
     def getitem(self, idx: int) -> int | TYPE_NULL_PTR:
         inode: Inode = self.inode
         disk: Disk = self.disk
         config: Config = disk.config
+        addr_slices: tuple[slice, ...] = config.addr_slices
+        decode_addr: Callable[[ByteString, int], int] = config.decode_block_addr
+        blocks: BlocksList = disk.blocks
 
         if idx < 0:
             raise IndexError(
@@ -307,78 +310,24 @@ class InodeIO:
         if idx < NUM_DIRECT_PTR:
             return inode.directs[idx]
 
-        # |--------------------------- INDIRECT ---------------------------|
-        idx -= NUM_DIRECT_PTR
-
-        def get_ptr_from_indirect_recursive(
-            idx: int, indirect: int | TYPE_NULL_PTR, recursive_depth: int = 1
-        ) -> int | TYPE_NULL_PTR:
-            if indirect == NULL_PTR:
+        # |------------------- INDIRECT / DOUBLE / TRIPLE -------------------|
+        root, spans, idx = self._locate_indirect(idx)
+        ptr: int | TYPE_NULL_PTR = getattr(inode, root)
+        # NOTE: one pass from the outermost index block inward, no call per level
+        for span in spans:
+            if ptr == NULL_PTR:
                 return NULL_PTR
-            if recursive_depth <= 0:
-                raise ValueError(f"{recursive_depth=} must be positive.")
-            if recursive_depth == 1:
-                off: int = idx * config.block_addr_length
-                return int.from_bytes(
-                    disk.blocks[indirect][off : off + config.block_addr_length],
-                    byteorder="big",
-                    signed=False,
-                )
-            elif recursive_depth == 2:
-                num_inode_addr_per_block = config.num_inode_addr_per_block
-            elif recursive_depth == 3:
-                num_inode_addr_per_block = config.num_inode_addr_double_range
-            else:
-                raise ValueError(f"{recursive_depth=} not supported.")
-
-            idx_lvl1 = idx // num_inode_addr_per_block
-            idx_lvl2 = idx % num_inode_addr_per_block
-
-            off_lvl1 = idx_lvl1 * config.block_addr_length
-
-            ptr_lvl1 = int.from_bytes(
-                disk.blocks[indirect][off_lvl1 : off_lvl1 + config.block_addr_length],
-                byteorder="big",
-                signed=False,
-            )
-            return get_ptr_from_indirect_recursive(
-                idx=idx_lvl2, indirect=ptr_lvl1, recursive_depth=recursive_depth - 1
-            )
-
-        if idx < config.num_inode_addr_per_block:
-            return get_ptr_from_indirect_recursive(
-                idx=idx, indirect=inode.indirect, recursive_depth=1
-            )
-
-        # |--------------------------- DOUBLE INDIRECT ---------------------------|
-        idx -= config.num_inode_addr_per_block
-        if idx < config.num_inode_addr_double_range:
-            return get_ptr_from_indirect_recursive(
-                idx=idx, indirect=inode.double_indirect, recursive_depth=2
-            )
-
-        # |--------------------------- TRIPLE INDIRECT ---------------------------|
-        idx -= config.num_inode_addr_double_range
-        if idx < config.num_inode_addr_triple_range:
-            return get_ptr_from_indirect_recursive(
-                idx=idx, indirect=inode.triple_indirect, recursive_depth=3
-            )
-
-        idx += (
-            NUM_DIRECT_PTR
-            + config.num_inode_addr_per_block
-            + config.num_inode_addr_double_range
-        )
-        range = (
-            NUM_DIRECT_PTR
-            + config.num_inode_addr_per_block
-            + config.num_inode_addr_double_range
-            + config.num_inode_addr_triple_range
-        )
-        raise IndexError(f"{idx=} is out of {range=}.")
+            slot, idx = divmod(idx, span)
+            ptr = decode_addr(blocks[ptr][addr_slices[slot]], 0)
+        return ptr
 
     def truncate_to(self, st_size: int = 0):
-        block_required = ceil_division(st_size, self.disk.config.block_size)
+        if st_size > self.inode.st_size:
+            # NOTE: growing allocates the NULL_BYTES blocks, every byte below st_size
+            # stays backed by a block
+            self._extend_to(st_size)
+            return None
+        block_required = self.disk.config.ceil_blocks(st_size)
         self._truncate_block_to(block_required)
         self.inode.st_size = st_size
 
@@ -386,10 +335,101 @@ class InodeIO:
         return self.inode.st_size
 
     # --- Private primitives ---
+    def _locate_indirect(self, idx: int) -> tuple[str, tuple[int, ...], int]:
+        """
+        Map a block index past the direct pointers to the inode field of its
+        index tree, the pointer span of every level from the top down and the
+        index inside that tree.
+        """
+        config: Config = self.disk.config
+        per_block: int = config.num_inode_addr_per_block
+        double_range: int = config.num_inode_addr_double_range
+        triple_range: int = config.num_inode_addr_triple_range
+
+        idx -= NUM_DIRECT_PTR
+        if idx < per_block:
+            return "indirect", (1,), idx
+        idx -= per_block
+        if idx < double_range:
+            return "double_indirect", (per_block, 1), idx
+        idx -= double_range
+        if idx < triple_range:
+            return "triple_indirect", (double_range, per_block, 1), idx
+
+        idx += NUM_DIRECT_PTR + per_block + double_range
+        range = NUM_DIRECT_PTR + per_block + double_range + triple_range
+        raise IndexError(f"{idx=} is out of {range=}.")
+
+    def _walk_from(self, start: int) -> Iterator[int]:
+        """
+        Yield the data block pointers from block index start up to the first
+        NULL_PTR, seeking to start by arithmetic instead of walking past the
+        pointers before it.
+        """
+        inode: Inode = self.inode
+        config: Config = self.disk.config
+        # NOTE: bound once, the loops below read them per pointer
+        per_block: int = config.num_inode_addr_per_block
+        double_range: int = config.num_inode_addr_double_range
+        blocks: BlocksList = self.disk.blocks
+
+        # |--------------------------- DIRECT ---------------------------|
+        if start < NUM_DIRECT_PTR:
+            for ptr in islice(inode.directs, start, None):
+                if ptr == NULL_PTR:
+                    return None
+                yield ptr
+            start = 0
+        else:
+            start -= NUM_DIRECT_PTR
+
+        # |------------------- INDIRECT / DOUBLE / TRIPLE -------------------|
+        for root, spans in (
+            ("indirect", (1,)),
+            ("double_indirect", (per_block, 1)),
+            ("triple_indirect", (double_range, per_block, 1)),
+        ):
+            if start >= spans[0] * per_block:
+                start -= spans[0] * per_block
+                continue
+            ptr = getattr(inode, root)
+            if ptr == NULL_PTR:
+                return None
+
+            # NOTE: one pointer iterator per level, the first descent starts at the slots of start
+            depth: int = len(spans)
+            stack: list[Iterator[int]] = []
+            for level, span in enumerate(spans, start=1):
+                slot, start = divmod(start, span)
+                ptrs = islice(
+                    iter_addrs(blocks[ptr][:], config), slot, None
+                )
+                stack.append(ptrs)
+                if level < depth:
+                    ptr = next(ptrs, NULL_PTR)
+                    if ptr == NULL_PTR:
+                        return None
+
+            while stack:
+                ptr = next(stack[-1], -1)
+                if ptr == -1:  # NOTE: index block exhausted, back to its parent
+                    stack.pop()
+                elif ptr == NULL_PTR:
+                    return None
+                elif len(stack) == depth:
+                    yield ptr
+                else:
+                    stack.append(iter_addrs(blocks[ptr][:], config))
+        return None
+
     def _setitem(self, idx: int, value: int) -> None:
         inode: Inode = self.inode
         disk: Disk = self.disk
         config: Config = disk.config
+        addr_slices: tuple[slice, ...] = config.addr_slices
+        encode_addr: Callable[[int], bytes] = config.encode_block_addr
+        decode_addr: Callable[[ByteString, int], int] = config.decode_block_addr
+        blocks: BlocksList = disk.blocks
 
         if value == NULL_PTR:
             raise ValueError(
@@ -406,99 +446,49 @@ class InodeIO:
             inode.directs[idx] = value
             return None
 
-        # |--------------------------- INDIRECT ---------------------------|
-        idx -= NUM_DIRECT_PTR
-
-        def set_ptr_from_indirect_recursive(
-            idx: int, indirect: int | TYPE_NULL_PTR, recursive_depth: int = 1
-        ) -> None:
-            if recursive_depth <= 0:
-                raise ValueError(f"{recursive_depth=} must be positive.")
-
-            if indirect == NULL_PTR:
-                indirect = disk.blocks_bitmap.find_and_flip_free()
-                disk.blocks[indirect][:] = NULL_BYTES * config.block_size
-                if recursive_depth == 1:
-                    inode.indirect = indirect
-                elif recursive_depth == 2:
-                    inode.double_indirect = indirect
-                elif recursive_depth == 3:
-                    inode.triple_indirect = indirect
-                else:
-                    raise ValueError(f"{recursive_depth=} not supported.")
-
-            if recursive_depth == 1:
-                off: int = idx * config.block_addr_length
-                disk.blocks[indirect][off : off + config.block_addr_length] = (
-                    value.to_bytes(
-                        length=config.block_addr_length, byteorder="big", signed=False
-                    )
-                )
-                return None
-            elif recursive_depth == 2:
-                num_inode_addr_per_block = config.num_inode_addr_per_block
-            elif recursive_depth == 3:
-                num_inode_addr_per_block = config.num_inode_addr_double_range
-            else:
-                raise ValueError(f"{recursive_depth=} not supported.")
-
-            idx_lvl1 = idx // num_inode_addr_per_block
-            idx_lvl2 = idx % num_inode_addr_per_block
-
-            off_lvl1 = idx_lvl1 * config.block_addr_length
-
-            ptr_lvl1 = int.from_bytes(
-                disk.blocks[indirect][off_lvl1 : off_lvl1 + config.block_addr_length],
-                byteorder="big",
-                signed=False,
-            )
-            if ptr_lvl1 == NULL_PTR:
-                child_ptr = self.disk.blocks_bitmap.find_and_flip_free()
-                disk.blocks[child_ptr][:] = NULL_BYTES * config.block_size
+        # |------------------- INDIRECT / DOUBLE / TRIPLE -------------------|
+        root, spans, idx = self._locate_indirect(idx)
+        ptr: int | TYPE_NULL_PTR = getattr(inode, root)
+        if ptr == NULL_PTR:
+            ptr = disk.blocks_bitmap.find_and_flip_free()
+            blocks[ptr][:] = config.zero_block
+            setattr(inode, root, ptr)
+
+        # NOTE: walk the index blocks inward, missing ones are allocated on the way
+        for span in spans[:-1]:
+            slot, idx = divmod(idx, span)
+            # NOTE: looked up once, the same index block is read and maybe written
+            block: BlockView = blocks[ptr]
+            child_ptr: int | TYPE_NULL_PTR = decode_addr(block[addr_slices[slot]], 0)
+            if child_ptr == NULL_PTR:
+                child_ptr = disk.blocks_bitmap.find_and_flip_free()
+                blocks[child_ptr][:] = config.zero_block
                 # store the child's pointer into the parent index block slot
-                disk.blocks[indirect][
-                    off_lvl1 : off_lvl1 + config.block_addr_length
-                ] = child_ptr.to_bytes(
-                    length=config.block_addr_length, byteorder="big", signed=False
-                )
-                ptr_lvl1 = child_ptr
-            return set_ptr_from_indirect_recursive(
-                idx=idx_lvl2, indirect=ptr_lvl1, recursive_depth=recursive_depth - 1
-            )
+                block[addr_slices[slot]] = encode_addr(child_ptr)
+            ptr = child_ptr
 
-        if idx < config.num_inode_addr_per_block:
-            return set_ptr_from_indirect_recursive(
-                idx=idx, indirect=inode.indirect, recursive_depth=1
-            )
+        blocks[ptr][addr_slices[idx]] = encode_addr(value)
+        return None
 
-        # |--------------------------- DOUBLE INDIRECT ---------------------------|
-        idx -= config.num_inode_addr_per_block
-
-        if idx < config.num_inode_addr_double_range:
-            return set_ptr_from_indirect_recursive(
-                idx=idx, indirect=inode.double_indirect, recursive_depth=2
-            )
-
-        # |--------------------------- TRIPLE INDIRECT ---------------------------|
-        idx -= config.num_inode_addr_double_range
-
-        if idx < config.num_inode_addr_triple_range:
-            return set_ptr_from_indirect_recursive(
-                idx=idx, indirect=inode.triple_indirect, recursive_depth=3
-            )
-
-        idx += (
-            NUM_DIRECT_PTR
-            + config.num_inode_addr_per_block
-            + config.num_inode_addr_double_range
-        )
-        range = (
-            NUM_DIRECT_PTR
-            + config.num_inode_addr_per_block
-            + config.num_inode_addr_double_range
-            + config.num_inode_addr_triple_range
-        )
-        raise IndexError(f"{idx=} is out of {range=}.")
+    def _extend_to(self, st_size: int) -> None:
+        """Grow the file with NULL_BYTES up to st_size, without building the gap in memory."""
+        inode: Inode = self.inode
+        disk: Disk = self.disk
+        block_size: int = disk.config.block_size
+        zeros: bytes = disk.config.zero_block
+
+        # NOTE: as block may not be empty, may have garbage data so please fill with NULL_BYTES
+        tail_off: int = inode.st_size % block_size
+        tail_ptr = self.getitem(inode.st_size // block_size) if tail_off else NULL_PTR
+        if tail_ptr != NULL_PTR:
+            last_block = disk.blocks[tail_ptr]
+            last_block[tail_off:] = memoryview(zeros)[tail_off:]
+
+        ceil_blocks = disk.config.ceil_blocks
+        for block_idx in range(ceil_blocks(inode.st_size), ceil_blocks(st_size)):
+            block_ptr = self._allocate_block(st_size=block_idx * block_size)
+            disk.blocks[block_ptr][:] = zeros
+        inode.st_size = st_size
 
     def _allocate_block(self, st_size: int | None = None) -> int:
         """
@@ -510,9 +500,7 @@ class InodeIO:
             st_size = self.inode.st_size
 
         block_ptr = disk.blocks_bitmap.find_and_flip_free()
-        self._setitem(
-            idx=ceil_division(st_size, self.disk.config.block_size), value=block_ptr
-        )
+        self._setitem(idx=disk.config.ceil_blocks(st_size), value=block_ptr)
         return block_ptr
 
     def _truncate_block_to(
@@ -525,6 +513,9 @@ class InodeIO:
         inode: Inode = self.inode
         disk: Disk = self.disk
         config: Config = disk.config
+        # NOTE: bound once, the nested helpers below read them per pointer
+        addr_len: int = config.block_addr_length
+        blocks: BlocksList = disk.blocks
 
         for idx in range(NUM_DIRECT_PTR):
             ptr = inode.directs[idx]
@@ -548,53 +539,38 @@ class InodeIO:
                 raise ValueError(f"{indirect=} must not be NULL_PTR.")
             if recursive_depth <= 0:
                 raise ValueError(f"{recursive_depth=} must be positive.")
-            data: BlockView
-            off: int
-            is_empty: bool
+            data: BlockView = blocks[indirect]
+            raw: ByteString = data[:]
+            used: int = count_addrs(raw, addr_len)
+            # NOTE: lazy for the non native widths, only the used slots are decoded
+            ptrs: Iterator[int] = islice(iter_addrs(raw, config), used)
+            first_cleared: int | None = None
             if recursive_depth == 1:
-                data = disk.blocks[indirect]
-                is_empty = True
-                for idx in range(config.num_inode_addr_per_block):
-                    off = idx * config.block_addr_length
-                    ptr = int.from_bytes(
-                        data[off : off + config.block_addr_length],
-                        byteorder="big",
-                        signed=False,
-                    )
-                    if ptr == NULL_PTR:
-                        return is_empty
-                    if block_required <= 0:
+                # NOTE: data pointers, the kept prefix is plain arithmetic on block_required
+                addrs: list[int] = list(ptrs)
+                if block_required < used:
+                    first_cleared = max(block_required, 0)
+                    clear = disk.blocks_bitmap.clear
+                    for ptr in islice(addrs, first_cleared, None):
+                        clear(ptr)
+                block_required -= used
+            else:
+                for idx, ptr in enumerate(ptrs):
+                    if truncate_indirect_recursive(
+                        indirect=ptr, recursive_depth=recursive_depth - 1
+                    ):
                         disk.blocks_bitmap.clear(ptr)
-                        data[off : off + config.block_addr_length] = (
-                            NULL_BYTES * config.block_addr_length
-                        )
-                    else:
-                        is_empty = False
-                    block_required -= 1
-                return is_empty
-
-            data = disk.blocks[indirect]
-            is_empty = True
-            for idx in range(config.num_inode_addr_per_block):
-                off = idx * config.block_addr_length
-                child_ptr: int | TYPE_NULL_PTR = int.from_bytes(
-                    data[off : off + config.block_addr_length],
-                    byteorder="big",
-                    signed=False,
-                )
-                if child_ptr == NULL_PTR:
-                    return is_empty
-                child_is_empty = truncate_indirect_recursive(
-                    indirect=child_ptr, recursive_depth=recursive_depth - 1
-                )
-                if child_is_empty:
-                    disk.blocks_bitmap.clear(child_ptr)
-                    data[off : off + config.block_addr_length] = (
-                        NULL_BYTES * config.block_addr_length
-                    )
-                else:
-                    is_empty = False
-            return is_empty
+                        if first_cleared is None:
+                            first_cleared = idx
+            # NOTE: block_required only decreases so the cleared slots are always the tail
+            if first_cleared is None:
+                return used == 0
+            if first_cleared == 0:
+                return True  # NOTE: the caller frees this block, no need to zero it
+            data[first_cleared * addr_len : used * addr_len] = NULL_BYTES * (
+                (used - first_cleared) * addr_len
+            )
+            return False
 
         if truncate_indirect_recursive(inode.indirect, recursive_depth=1):
             disk.blocks_bitmap.clear(inode.indirect)
@@ -1,11 +1,21 @@
 from enum import Flag, auto
-from io import SEEK_CUR, SEEK_END, SEEK_SET, BytesIO
+from io import SEEK_CUR, SEEK_END, SEEK_SET, RawIOBase
+from struct import error as struct_error
 from types import TracebackType
-from typing import ByteString, Iterable, Literal, NamedTuple, Self, TypeAlias
+from typing import (
+    ByteString,
+    Iterable,
+    Iterator,
+    Literal,
+    NamedTuple,
+    Self,
+    Sequence,
+    TypeAlias,
+)
 
 from .config import Config
 from .constants import MAX_NAME_LEN
-from .inode import Inode, InodeIO, InodeMode
+from .inode import Inode, InodeIO, InodeMode, is_directory, peek_mode
 from .protocol import Disk
 from .utils import ceil_division, current_time_epoch
 
@@ -35,6 +45,16 @@ class FileMode(Flag):
     READWRITE = READ | WRITE
 
 
+# NOTE: raw bits of the flags, open/FileIO test mode.value against them once instead
+# of building a new FileMode per & / | (Flag operators go through the enum machinery)
+_M_READ: int = FileMode.READ.value
+_M_WRITE: int = FileMode.WRITE.value
+_M_APPEND: int = FileMode.APPEND.value
+_M_CREATE: int = FileMode.CREATE.value
+_M_EXCLUSIVE: int = FileMode.EXCLUSIVE.value
+_M_TRUNCATE: int = FileMode.TRUNCATE.value
+
+
 class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path...
     """Helper class for directory operations on an Inode"""
 
@@ -48,6 +68,18 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
         inode: Inode
         inode_ptr: int
 
+    # NOTE: built on every chdir/path walk, slots keep instances small and without a __dict__
+    __slots__ = (
+        "disk",
+        "config",
+        "inode_ptr",
+        "inode_io",
+        "_name_index",
+        "_data",
+        "_inode_dirty",
+        "_entry_overhead",
+    )
+
     def __init__(self, disk: Disk, inode_ptr: int, inode: Inode):
         if (
             inode.st_mode != InodeMode.DIRECTORY
@@ -57,14 +89,33 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
         self.config: Config = disk.config
         self.inode_ptr: int = inode_ptr
         self.inode_io: InodeIO = InodeIO(inode, disk)
+        # NOTE: name -> inode_ptr of every entry and the serialized entries, built on
+        # the first read and kept in sync by _add_entry/_remove_entry; like the inode
+        # itself they are per instance, so entries changed through another Directory
+        # of the same inode are not seen here, call sites build a fresh Directory per
+        # path walk
+        self._name_index: dict[bytes, int] | None = None
+        self._data: bytes | None = None
+        # NOTE: set when the directory data (so st_size/blocks) changed since the inode was written
+        self._inode_dirty: bool = False
+        # NOTE: bytes of an entry besides its name, the length prefix and the inode_ptr
+        self._entry_overhead: int = NAME_REPR_LEN + self.config.inode_addr_length
 
     @classmethod
     def new(
         cls, disk: Disk, inode_ptr: int, inode: Inode, parent_inode_ptr: int
     ) -> Self:
         new_dir = cls(disk, inode_ptr, inode)
-        new_dir._add_entry(name=b".", inode_ptr=inode_ptr)
-        new_dir._add_entry(name=b"..", inode_ptr=parent_inode_ptr)
+        # NOTE: '.' and '..' are the whole data of the new directory, both entries are
+        # serialized together and written by one write_at instead of one per entry
+        encode_inode_addr = disk.config.encode_inode_addr
+        data = bytearray(b"\x01.")  # NOTE: NAME_REPR_LEN is a single byte
+        data += encode_inode_addr(inode_ptr)
+        data += b"\x02.."
+        data += encode_inode_addr(parent_inode_ptr)
+        new_dir.inode_io.write_at(0, data)
+        new_dir._data = bytes(data)
+        new_dir._inode_dirty = True
         new_dir._write_self_inode_back()
         return new_dir
     
@@ -83,39 +134,122 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
         return prefix, new_src, new_dest
 
     def _write_self_inode_back(self) -> None:
-        """Persist the in-memory inode to disk for this directory's inode."""
+        """Persist the in-memory inode to disk for this directory's inode, if it changed."""
+        if not self._inode_dirty:
+            return None
+        self.disk.flush()  # NOTE: allocations first, then the inode that uses them
         self.disk.inodes[self.inode_ptr][:] = self.inode_io.inode.to_bytes(self.config)
+        self._inode_dirty = False
+
+    def _read_data(self) -> bytes:
+        """Serialized entries of the directory, read from its blocks once"""
+        # read full is more efficient as directory generally have small content
+        data = self._data
+        if data is None:
+            data = self._data = self.inode_io.read_at(pos=0, n=-1)
+        return data
 
     def _iter_entries(self) -> Iterable["Directory._RawDirEntry"]:
         """Iter all entries in the directory"""
-        inode_io: InodeIO = self.inode_io
-        config: Config = self.disk.config
+        return self._parse_entries(self._read_data(), self.config)
 
-        # read full is more efficient as directory generally have small content
-        data: bytes = inode_io.read_at(pos=0, n=-1)
+    @classmethod
+    def _parse_entries(
+        cls, data: bytes, config: Config
+    ) -> Iterator["Directory._RawDirEntry"]:
+        """Iter the entries serialized in the directory data"""
+        # NOTE: the name length is a single byte (NAME_REPR_LEN), indexing gives the int
+        # directly; the pointer is decoded in place at its offset, no bytes copy
+        addr_len: int = config.inode_addr_length
+        decode_addr = config.decode_inode_addr
+        size: int = len(data)
         offset = 0
-        while offset < len(data):
-            name_len_bytes = data[offset : offset + 1]
-            name_len = int.from_bytes(name_len_bytes, byteorder="big", signed=False)
-            name = data[offset + 1 : offset + 1 + name_len]
-            if len(name) != name_len:
+        while offset < size:
+            name_len = data[offset]
+            name_end = offset + 1 + name_len
+            if name_end > size:
                 raise ValueError("Insufficient data for name.")
-            inode_ptr_bytes = data[
-                offset + 1 + name_len : offset + 1 + name_len + config.inode_addr_length
-            ]
-            if len(inode_ptr_bytes) != config.inode_addr_length:
+            ptr_end = name_end + addr_len
+            if ptr_end > size:
                 raise ValueError("Insufficient data for inode_ptr.")
-            inode_ptr = int.from_bytes(inode_ptr_bytes, byteorder="big", signed=False)
-            offset += 1 + name_len + config.inode_addr_length
-            yield self.__class__._RawDirEntry(name, inode_ptr)
+            yield cls._RawDirEntry(
+                data[offset + 1 : name_end], decode_addr(data, name_end)
+            )
+            offset = ptr_end
+
+    # NOTE: _parse_index/_parse_names are the bulk forms of _parse_entries, one plain
+    # loop without a generator or a _RawDirEntry per entry; bounds are checked once
+    # at the end, an entry running past the data leaves the offset past its size
+    @staticmethod
+    def _parse_index(data: bytes, config: Config) -> dict[bytes, int]:
+        """Name -> inode_ptr of every entry serialized in the directory data"""
+        addr_len: int = config.inode_addr_length
+        decode_addr = config.decode_inode_addr
+        size: int = len(data)
+        index: dict[bytes, int] = {}
+        offset = 0
+        try:
+            while offset < size:
+                name_end = offset + 1 + data[offset]
+                index[data[offset + 1 : name_end]] = decode_addr(data, name_end)
+                offset = name_end + addr_len
+        except struct_error:  # NOTE: native width decoder past the end of data
+            offset = size + 1
+        if offset != size:
+            raise ValueError("Insufficient data for directory entry.")
+        return index
+
+    @staticmethod
+    def _parse_names(data: bytes, config: Config) -> list[bytes]:
+        """Names of every entry serialized in the directory data, pointers are skipped"""
+        addr_len: int = config.inode_addr_length
+        size: int = len(data)
+        names: list[bytes] = []
+        offset = 0
+        while offset < size:
+            name_end = offset + 1 + data[offset]
+            names.append(data[offset + 1 : name_end])
+            offset = name_end + addr_len
+        if offset != size:
+            raise ValueError("Insufficient data for directory entry.")
+        return names
+
+    @staticmethod
+    def _entry_offset(data: bytes, name: bytes, addr_len: int, start: int = 0) -> int:
+        """Offset of the entry name in the directory data from start, -1 if missing"""
+        # NOTE: the length byte is compared first, only same length names are sliced
+        name_len: int = len(name)
+        size: int = len(data)
+        offset: int = start
+        while offset < size:
+            entry_len = data[offset]
+            if entry_len == name_len and data[offset + 1 : offset + 1 + name_len] == name:
+                return offset
+            offset += 1 + entry_len + addr_len
+        return -1
+
+    def _ensure_index(self) -> dict[bytes, int]:
+        """Name index of the entries, parsed from the directory data once"""
+        name_index = self._name_index
+        if name_index is None:
+            name_index = self._name_index = self._parse_index(
+                self._read_data(), self.config
+            )
+        return name_index
 
     def _find_entry(self, name: bytes) -> int | None:
         """Find an entry by name, return inode number or None"""
-        entries = self._iter_entries()
-        for entry in entries:
-            if entry.name == name:
-                return entry.inode_ptr
-        return None
+        return self._ensure_index().get(name)
+
+    def _lookup(self, name: bytes) -> "Directory._InodeResult | None":
+        """Find an entry by name, return its inode number with the parsed inode or None"""
+        inode_ptr = self._ensure_index().get(name)
+        if inode_ptr is None:
+            return None
+        return self.__class__._InodeResult(
+            inode=Inode.from_bytes(self.disk.inodes[inode_ptr], config=self.config),
+            inode_ptr=inode_ptr,
+        )
 
     def _add_entry(self, name: bytes, inode_ptr: int) -> None:
         """Add a new entry to the directory"""
@@ -123,128 +257,176 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
             raise ValueError(f"{len(name)=} can be at max 255.")
 
         inode_io: InodeIO = self.inode_io
-        config: Config = self.disk.config
-
-        # Serialize the new entry
-        entry_data = (
-            len(name).to_bytes(length=NAME_REPR_LEN, byteorder="big", signed=False)
-            + name
-            + inode_ptr.to_bytes(
-                length=config.inode_addr_length, byteorder="big", signed=False
-            )
-        )
+
+        # Serialize the new entry, built in place as write_at takes any ByteString
+        entry_data = bytearray((len(name),))  # NOTE: NAME_REPR_LEN is a single byte
+        entry_data += name
+        entry_data += self.config.encode_inode_addr(inode_ptr)
 
         # Append to the end of directory data
         pos = inode_io.get_size()
         inode_io.write_at(pos, entry_data)
+        self._inode_dirty = True
+        if self._data is not None:
+            self._data += entry_data
+        if self._name_index is not None:
+            self._name_index[name] = inode_ptr
 
     def _remove_entry(self, name: bytes) -> int:
         """Remove an entry from the directory and compact (no fragmentation).
         Returns the inode_ptr of the removed entry.
         """
         inode_io: InodeIO = self.inode_io
-        config: Config = self.disk.config
-
-        # Parse entries and find the one to remove
-        found_entry: "Directory._RawDirEntry | None" = None
-        entries: list["Directory._RawDirEntry"] = []
-        for entry in self._iter_entries():
-            if entry.name != name:
-                entries.append(entry)
-            else:
-                if found_entry is not None:
-                    raise RuntimeError(f"Multiple entries with same {name=}")
-                found_entry = entry
-        if found_entry is None:
-            raise FileNotFoundError(f"Entry '{name!r}' not found")
-
-        # Build new directory data without the removed entry
-        new_data = bytearray()
+        config: Config = self.config
+        addr_len: int = config.inode_addr_length
 
-        for entry in entries:
-            # Re-serialize each entry (to ensure contiguous data)
-            entry_bytes = (
-                len(entry.name).to_bytes(
-                    length=NAME_REPR_LEN, byteorder="big", signed=False
-                )
-                + entry.name
-                + entry.inode_ptr.to_bytes(
-                    length=config.inode_addr_length, byteorder="big", signed=False
-                )
-            )
-            new_data.extend(entry_bytes)
-
-        # Write the compacted directory data
-        inode_io.write_at(0, bytes(new_data))
+        # Find the byte range of the entry to remove
+        data: bytes = self._read_data()
+        start_off: int = self._entry_offset(data, name, addr_len)
+        if start_off == -1:
+            raise FileNotFoundError(f"Entry '{name!r}' not found")
+        end_off: int = start_off + self._entry_overhead + len(name)
+        if self._entry_offset(data, name, addr_len, end_off) != -1:
+            raise RuntimeError(f"Multiple entries with same {name=}")
+        inode_ptr: int = config.decode_inode_addr(data, end_off - addr_len)
+
+        # NOTE: entries are contiguous and kept as is, so the entries after the removed
+        # one are moved down over it instead of re-serializing the whole directory
+        tail: bytes = data[end_off:]
+        inode_io.write_at(start_off, tail)
         # truncate
-        inode_io.truncate_to(len(new_data))
+        inode_io.truncate_to(len(data) - (end_off - start_off))
+        self._inode_dirty = True
+        self._data = data[:start_off] + tail
+        if self._name_index is not None:
+            del self._name_index[name]
 
-        return found_entry.inode_ptr
+        return inode_ptr
 
-    def get_childs_inode(self, *names: bytes) -> "Directory._InodeResult | None":
-        if len(names) == 0:
-            return self.__class__._InodeResult(
-                inode_ptr=self.inode_ptr, inode=self.inode_io.inode
-            )
-        *dir_names, last_name = names
+    def _walk_ptr(self, names: Iterable[bytes]) -> int | None:
+        """Resolve names below this directory, return the last inode_ptr or None if missing.
 
-        current = self
-        for name in dir_names:
+        Only inode pointers are kept along the way, no Directory is built for the
+        directories in between, they are scanned once up to the name instead of being
+        indexed; an inode is parsed only to read the directory it is, never the last one.
+        """
+        disk: Disk = self.disk
+        config: Config = self.config
+        inode_ptr: int = self.inode_ptr
+        for name in names:
             if name == b".":
                 continue
-            inode_ptr = current._find_entry(name)
-            if inode_ptr is None:
+            if inode_ptr == self.inode_ptr:
+                found = self._find_entry(name)  # NOTE: this directory keeps an index
+            else:
+                inode_data = disk.inodes[inode_ptr]
+                if not is_directory(inode_data):
+                    raise NotADirectoryError(f"{inode_ptr=} is not a DIRECTORY")
+                inode = Inode.from_bytes(inode_data, config=config)
+                data: bytes = InodeIO(inode, disk).read_at(pos=0, n=-1)
+                offset = self._entry_offset(data, name, config.inode_addr_length)
+                found = (
+                    None
+                    if offset == -1
+                    else config.decode_inode_addr(data, offset + 1 + len(name))
+                )
+            if found is None:
                 return None
-            current = Directory(
-                disk=self.disk,
-                inode_ptr=inode_ptr,
-                inode=Inode.from_bytes(self.disk.inodes[inode_ptr], config=self.config),
-            )
+            inode_ptr = found
+        return inode_ptr
 
-        inode_ptr = current._find_entry(last_name)
+    def _walk(self, names: Iterable[bytes]) -> "Directory._InodeResult | None":
+        """Resolve names below this directory, return the last inode or None if missing."""
+        inode_ptr = self._walk_ptr(names)
         if inode_ptr is None:
             return None
-        return self.__class__._InodeResult(
-            inode_ptr=inode_ptr,
-            inode=Inode.from_bytes(self.disk.inodes[inode_ptr], config=self.config),
-        )
+        if inode_ptr == self.inode_ptr:
+            inode = self.inode_io.inode
+        else:
+            inode = Inode.from_bytes(self.disk.inodes[inode_ptr], config=self.config)
+        return self.__class__._InodeResult(inode=inode, inode_ptr=inode_ptr)
+
+    def get_childs_inode(self, *names: bytes) -> "Directory._InodeResult | None":
+        return self._walk(names)
 
     def listdir(self, ignore_default: bool = True) -> list[bytes]:
-        it = self._iter_entries()
-        if ignore_default:
-            it = filter(
-                lambda entry: not (entry.name == b"." or entry.name == b".."), it
+        names = self._parse_names(self._read_data(), self.config)
+        if not ignore_default:
+            return names
+        return [name for name in names if name != b"." and name != b".."]
+
+    def scan_children(
+        self, ignore_default: bool = True
+    ) -> dict[bytes, "Directory._InodeResult"]:
+        """Every entry of this directory with its parsed inode, in entry order.
+
+        One pass over the name index, for callers that look at each child anyway
+        instead of a get_childs_inode walk from the root per child.
+        """
+        disk_inodes = self.disk.inodes
+        config: Config = self.config
+        InodeResult = self.__class__._InodeResult
+        return {
+            name: InodeResult(
+                inode=Inode.from_bytes(disk_inodes[inode_ptr], config=config),
+                inode_ptr=inode_ptr,
             )
-        return list(map(lambda entry: entry.name, it))
+            for name, inode_ptr in self._ensure_index().items()
+            if not ignore_default or (name != b"." and name != b"..")
+        }
 
-    def listtree(self, ignore_default: bool = True) -> LIST_TREE_TYPE:
-        result: LIST_TREE_TYPE = []
-        for entry in self._iter_entries():
+    def iter_tree(
+        self, ignore_default: bool = True
+    ) -> Iterator[tuple[int, bytes, bool]]:
+        """Walk the tree below this directory depth first, yield (depth, name, is_dir).
+
+        A directory is yielded right before its own entries, the walk keeps an explicit
+        stack of entry iterators, one per open directory, instead of recursing.
+        """
+        disk: Disk = self.disk
+        config: Config = self.config
+        stack: list[Iterator[Directory._RawDirEntry]] = [iter(self._iter_entries())]
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop()
+                continue
+            depth: int = len(stack) - 1
             if entry.name == b"." or entry.name == b"..":
                 if not ignore_default:
-                    result.append(entry.name)
+                    yield depth, entry.name, False
                 continue
-            inode = Inode.from_bytes(self.disk.inodes[entry.inode_ptr], self.config)
-            if inode.st_mode == InodeMode.DIRECTORY:
-                directory = Directory(self.disk, entry.inode_ptr, inode)
-                result.append(
-                    (entry.name, directory.listtree(ignore_default=ignore_default))
-                )
+            inode_data = disk.inodes[entry.inode_ptr]
+            # NOTE: files only need their name, the mode byte is checked before parsing
+            if is_directory(inode_data):
+                yield depth, entry.name, True
+                inode = Inode.from_bytes(inode_data, config)
+                data: bytes = InodeIO(inode, disk).read_at(pos=0, n=-1)
+                stack.append(self._parse_entries(data, config))
             else:
-                result.append(entry.name)
+                yield depth, entry.name, False
+
+    def listtree(self, ignore_default: bool = True) -> LIST_TREE_TYPE:
+        result: LIST_TREE_TYPE = []
+        # NOTE: levels[depth] is the list the entries at depth are appended to
+        levels: list[LIST_TREE_TYPE] = [result]
+        for depth, name, is_dir in self.iter_tree(ignore_default=ignore_default):
+            del levels[depth + 1 :]
+            if is_dir:
+                children: LIST_TREE_TYPE = []
+                levels[depth].append((name, children))
+                levels.append(children)
+            else:
+                levels[depth].append(name)
         return result
 
     def mkdir(self, name: bytes, exist_ok: bool = False) -> "Directory":
         # Check if name already exists
-        inode_ptr = self._find_entry(name)
-        if inode_ptr is not None:
+        result = self._lookup(name)
+        if result is not None:
             if exist_ok:
                 return Directory(
-                    disk=self.disk,
-                    inode_ptr=inode_ptr,
-                    inode=Inode.from_bytes(
-                        self.disk.inodes[inode_ptr], config=self.config
-                    ),
+                    disk=self.disk, inode_ptr=result.inode_ptr, inode=result.inode
                 )
             raise FileExistsError(f"Entry '{name!r}' already exists")
         inode_ptr = self.disk.inodes_bitmap.find_and_flip_free()
@@ -259,26 +441,19 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
         )
 
     def makedirs(self, *names: bytes, exist_ok: bool = False) -> "Directory":
-        name, *rest = names
-        if not rest:
-            return self.mkdir(name, exist_ok=exist_ok)
-        child = self.mkdir(name, exist_ok=True)
-        return child.makedirs(*rest, exist_ok=exist_ok)
+        *dir_names, last_name = names
+        current = self
+        for name in dir_names:
+            current = current.mkdir(name, exist_ok=True)
+        return current.mkdir(last_name, exist_ok=exist_ok)
 
     def chdir(self, *names: bytes) -> "Directory":
-        current = self
-        for name in names:
-            if name == b".":
-                continue
-            inode_ptr = current._find_entry(name)
-            if inode_ptr is None:
-                raise FileNotFoundError(f"Directory '{name!r}' not exists")
-            current = Directory(
-                disk=self.disk,
-                inode_ptr=inode_ptr,
-                inode=Inode.from_bytes(self.disk.inodes[inode_ptr], config=self.config),
-            )
-        return current
+        result = self._walk(names)
+        if result is None:
+            raise FileNotFoundError(f"Directory '{names!r}' not exists")
+        if result.inode is self.inode_io.inode:
+            return self
+        return Directory(disk=self.disk, inode_ptr=result.inode_ptr, inode=result.inode)
 
     def remove(
         self, name: bytes, removed_ok: bool = False, *, inode_ptr: int | None = None
@@ -325,15 +500,16 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
         self._write_self_inode_back()
 
     def removedirs(self, *names: bytes) -> None:
-        name, *rest = names
-        if not rest:
-            return self.rmdir(name)
-        child = self.chdir(name)
-        child.removedirs(*rest)
-        return self.rmdir(name)
+        *dir_names, _ = names
+        parents: list[Directory] = [self]
+        for name in dir_names:
+            parents.append(parents[-1].chdir(name))
+        # NOTE: deepest first, every parent is empty once its child is removed
+        for parent, name in zip(reversed(parents), reversed(names)):
+            parent.rmdir(name)
 
     def rename(
-        self, src: list[bytes], dest: list[bytes], *, overwrite: bool = False
+        self, src: Sequence[bytes], dest: Sequence[bytes], *, overwrite: bool = False
     ) -> None:
         *src_dir_names, src_name = src
         *dest_dir_names, dest_name = dest
@@ -344,10 +520,10 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
         src_dir = current.chdir(*src_dir_names)
         dest_dir = current.chdir(*dest_dir_names)
 
-        inode_ptr = src_dir._find_entry(src_name)
-        if inode_ptr is None:
+        result = src_dir._lookup(src_name)
+        if result is None:
             raise FileNotFoundError(f"{src=} path not exists.")
-        inode = Inode.from_bytes(self.disk.inodes[inode_ptr], config=self.config)
+        inode_ptr, inode = result.inode_ptr, result.inode
 
         if overwrite:
             dest_dir.remove(
@@ -356,10 +532,14 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
         elif dest_dir._find_entry(dest_name) is not None:
             raise FileExistsError(f"{dest=} path already exists.")
 
-        if inode.st_mode == InodeMode.DIRECTORY:
-            directory = src_dir.chdir(src_name)
+        # NOTE: src_dir is dest_dir when the common prefix is the whole parent path,
+        # then '..' already points to it; the moved directory is built from the lookup
+        # result instead of walking to src_name again
+        if inode.st_mode == InodeMode.DIRECTORY and src_dir is not dest_dir:
+            directory = Directory(disk=self.disk, inode_ptr=inode_ptr, inode=inode)
             directory._remove_entry(b"..")
             directory._add_entry(b"..", dest_dir.inode_ptr)
+            directory._write_self_inode_back()
 
         inode_ptr_removed = src_dir._remove_entry(src_name)
         if inode_ptr != inode_ptr_removed:
@@ -373,8 +553,8 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
 
     def copy_file(
         self,
-        src: list[bytes],
-        dest: list[bytes],
+        src: Sequence[bytes],
+        dest: Sequence[bytes],
         overwrite: bool = False,
         chunk_size: int | None = None,
     ) -> None:
@@ -393,36 +573,96 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
                 dest_name, removed_ok=True
             )  # NOTE: can raise IsADirectoryError
 
-        with (
-            dest_dir.open(
-                dest_name, mode=FileMode.CREATE | FileMode.WRITE | FileMode.EXCLUSIVE
-            ) as dest_file,
-            src_dir.open(src_name, mode=FileMode.READ) as src_file,
-        ):
-            while data := src_file.read(size=chunk_size):
-                dest_file.write(data)
-                dest_file.flush()
+        src_dir._copy_file_to(src_name, dest_dir, dest_name, chunk_size=chunk_size)
+
+    def _copy_file_to(
+        self,
+        src_name: bytes,
+        dest_dir: "Directory",
+        dest_name: bytes,
+        chunk_size: int | None = None,
+    ) -> None:
+        """Copy the file src_name of this directory to a new file dest_name of dest_dir.
+
+        Goes through InodeIO directly, one reused chunk buffer and the destination
+        inode is written once at the end instead of after every chunk.
+        """
+        src = self._lookup(src_name)
+        if src is None:
+            raise FileNotFoundError(f"File '{src_name.decode()}' not found.")
+        if src.inode.st_mode != InodeMode.REGULAR_FILE:
+            raise IsADirectoryError(f"'{src_name=}' is not a file.")
+        dest = dest_dir._create_copy_target(dest_name)
+        buffer = self._copy_buffer(chunk_size, src.inode.st_size)
+        self._copy_data(src.inode, dest, buffer)
+
+    def _create_copy_target(self, name: bytes) -> "Directory._InodeResult":
+        """Create the empty destination file of a copy, it must not exist yet."""
+        if self._find_entry(name) is not None:
+            raise FileExistsError(f"File '{name.decode()}' already exists")
+        return self.create_empty_file(name)
+
+    def _copy_chunk_size(self, chunk_size: int | None) -> int:
+        """Size of the chunks a copy is done in, a whole number of blocks."""
+        config: Config = self.config
+        if chunk_size is None or chunk_size <= 0:
+            chunk_size = max(config.block_size * 64, 1 << 20)
+        # NOTE: whole blocks, every chunk is block aligned and a chunk smaller than a
+        # block would only add loop turns, a block is the least that is read anyway
+        return config.ceil_blocks(chunk_size) * config.block_size
+
+    def _copy_buffer(self, chunk_size: int | None, size: int) -> memoryview:
+        """Chunk buffer of a copy, no larger than the size of the data to copy."""
+        return memoryview(bytearray(min(self._copy_chunk_size(chunk_size), size)))
+
+    def _copy_data(
+        self, src_inode: Inode, dest: "Directory._InodeResult", buffer: memoryview
+    ) -> None:
+        """Copy the data of src_inode into the empty file dest through buffer."""
+        disk: Disk = self.disk
+        src_io = InodeIO(src_inode, disk)
+        dest_io = InodeIO(dest.inode, disk)
+        pos: int = 0
+        # NOTE: file backed disks drop the GIL inside their readinto/write syscalls and
+        # the in memory copies are memcpy sized per block run, every chunk is a loop turn
+        # where other threads get the GIL, so there is no C helper for this loop
+        while read := src_io.readinto(buffer, pos):
+            dest_io.write_at(pos, buffer[:read])
+            pos += read
+        dest.inode.st_mtime = current_time_epoch()
+        disk.flush()
+        disk.inodes[dest.inode_ptr][:] = dest.inode.to_bytes(self.config)
 
     def rm_tree(self, dir_name: bytes):
         if dir_name == b"." or dir_name == b"..":
             raise ValueError(f"{dir_name=} can't be self or parent")
+        disk: Disk = self.disk
+        config: Config = self.config
+        DIRECTORY = InodeMode.DIRECTORY
         child = self.chdir(dir_name)
-        for entry in child._iter_entries():
-            if entry.name == b"." or entry.name == b"..":
-                continue
-            inode = Inode.from_bytes(
-                self.disk.inodes[entry.inode_ptr], config=self.config
-            )
-            if inode.st_mode == InodeMode.DIRECTORY:
-                child.rm_tree(dir_name=entry.name)
-            else:
-                child.remove(name=entry.name, inode_ptr=entry.inode_ptr)
-        child.inode_io.truncate_to(0)
-        if child.inode_io.get_size() != 0:
-            raise RuntimeError(
-                f"Something went wrong, {child.inode_io.get_size()=} is not zero."
-            )
-        self.disk.inodes_bitmap.clear(child.inode_ptr)
+
+        # NOTE: the whole subtree is freed, so entries are never removed one by one
+        # from directories that go away anyway; a stack of directories replaces recursion
+        stack: list[tuple[int, Inode]] = [(child.inode_ptr, child.inode_io.inode)]
+        while stack:
+            inode_ptr, inode = stack.pop()
+            inode_io = InodeIO(inode, disk)
+            data: bytes = inode_io.read_at(pos=0, n=-1)
+            for entry in self._parse_entries(data, config):
+                if entry.name == b"." or entry.name == b"..":
+                    continue
+                entry_inode = Inode.from_bytes(disk.inodes[entry.inode_ptr], config)
+                if entry_inode.st_mode == DIRECTORY:
+                    stack.append((entry.inode_ptr, entry_inode))
+                else:
+                    InodeIO(entry_inode, disk).truncate_to(0)
+                    disk.inodes_bitmap.clear(entry.inode_ptr)
+            inode_io.truncate_to(0)
+            if inode_io.get_size() != 0:
+                raise RuntimeError(
+                    f"Something went wrong, {inode_io.get_size()=} is not zero."
+                )
+            disk.inodes_bitmap.clear(inode_ptr)
 
         inode_ptr_removed = self._remove_entry(dir_name)
         if child.inode_ptr != inode_ptr_removed:
@@ -433,69 +673,66 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
 
     def copy_tree(
         self,
-        src: list[bytes],
-        dest: list[bytes],
+        src: Sequence[bytes],
+        dest: Sequence[bytes],
         overwrite: bool = False,
         chunk_size: int | None = None,
     ) -> None:
         *dest_dir_names, dest_dir_name = dest
         
-        prefix, src, dest_dir_names = self.split_common_prefix(src, dest_dir_names)
+        prefix, src, dest_dir_names = self.split_common_prefix(list(src), dest_dir_names)
         current = self.chdir(*prefix)
         
         src_dir = current.chdir(*src)
         dest_parent_dir = current.chdir(*dest_dir_names)
         dest_dir = dest_parent_dir.mkdir(dest_dir_name, exist_ok=True)
 
-        def copy_tree_recursive(src_dir: "Directory", dest_dir: "Directory"):
+        disk: Disk = self.disk
+        config: Config = self.config
+        DIRECTORY = InodeMode.DIRECTORY
+        # NOTE: every file is copied as soon as its target is created, so a failure leaves
+        # no empty targets behind; the files share one chunk buffer, grown to the largest
+        # chunk needed so far
+        chunk: int = self._copy_chunk_size(chunk_size)
+        buffer: memoryview = memoryview(bytearray(0))
+        # NOTE: explicit stack of directory pairs instead of recursion
+        stack: list[tuple[Directory, Directory]] = [(src_dir, dest_dir)]
+        while stack:
+            src_dir, dest_dir = stack.pop()
             for entry in src_dir._iter_entries():
                 if entry.name == b"." or entry.name == b"..":
                     continue
-                inode = Inode.from_bytes(
-                    self.disk.inodes[entry.inode_ptr], config=self.config
-                )
-                if inode.st_mode == InodeMode.DIRECTORY:
+                inode = Inode.from_bytes(disk.inodes[entry.inode_ptr], config=config)
+                if inode.st_mode == DIRECTORY:
                     new_src_dir = Directory(
-                        disk=self.disk, inode_ptr=entry.inode_ptr, inode=inode
+                        disk=disk, inode_ptr=entry.inode_ptr, inode=inode
                     )
                     new_dest_dir = dest_dir.mkdir(entry.name, exist_ok=True)
-                    copy_tree_recursive(src_dir=new_src_dir, dest_dir=new_dest_dir)
+                    stack.append((new_src_dir, new_dest_dir))
                 else:
                     if overwrite:
                         dest_dir.remove(
                             entry.name, removed_ok=True
                         )  # NOTE: can raise IsADirectoryError
-                    with (
-                        dest_dir.open(
-                            entry.name,
-                            mode=FileMode.CREATE | FileMode.WRITE | FileMode.EXCLUSIVE,
-                        ) as dest_file,
-                        src_dir.open(entry.name, mode=FileMode.READ) as src_file,
-                    ):
-                        while data := src_file.read(size=chunk_size):
-                            dest_file.write(data)
-
-        copy_tree_recursive(src_dir=src_dir, dest_dir=dest_dir)
+                    target = dest_dir._create_copy_target(entry.name)
+                    if len(buffer) < min(chunk, inode.st_size):
+                        buffer = memoryview(bytearray(min(chunk, inode.st_size)))
+                    self._copy_data(inode, target, buffer)
 
     def exists(self, *names: bytes) -> bool:
-        *dir_names, last_name = names
-        try:
-            current = self.chdir(*dir_names)
-        except FileNotFoundError:
-            return False
-        return current._find_entry(last_name) is not None
+        return self._walk_ptr(names) is not None
 
     def isdir(self, *names: bytes) -> bool | None:
-        result = self.get_childs_inode(*names)
-        if result is None:
+        inode_ptr = self._walk_ptr(names)
+        if inode_ptr is None:
             return None
-        return result.inode.st_mode == InodeMode.DIRECTORY
+        return peek_mode(self.disk.inodes[inode_ptr]) == InodeMode.DIRECTORY
 
     def isfile(self, *names: bytes) -> bool | None:
-        result = self.get_childs_inode(*names)
-        if result is None:
+        inode_ptr = self._walk_ptr(names)
+        if inode_ptr is None:
             return None
-        return result.inode.st_mode == InodeMode.REGULAR_FILE
+        return peek_mode(self.disk.inodes[inode_ptr]) == InodeMode.REGULAR_FILE
 
     def create_empty_file(self, name: bytes) -> "Directory._InodeResult":
         inode_ptr = self.disk.inodes_bitmap.find_and_flip_free()
@@ -516,19 +753,20 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
                 mode = FileMode.WRITE | FileMode.CREATE
             else:
                 raise ValueError(f"Invalid mode: {mode}.")
+        raw: int = mode.value
         inode_ptr = self._find_entry(name)
         if inode_ptr is None:
-            if not mode & FileMode.CREATE:
+            if not raw & _M_CREATE:
                 raise FileNotFoundError(
                     f"File '{name.decode()}' not found (no CREATE flag)."
                 )
-            if mode & (FileMode.WRITE | FileMode.APPEND):
+            if raw & (_M_WRITE | _M_APPEND):
                 result = self.create_empty_file(name)
                 inode_ptr = result.inode_ptr
                 inode = result.inode
             else:
                 raise FileNotFoundError(f"File '{name.decode()}' not found.")
-        elif (mode & FileMode.CREATE) and (mode & FileMode.EXCLUSIVE):
+        elif raw & _M_CREATE and raw & _M_EXCLUSIVE:
             raise FileExistsError(f"File '{name.decode()}' already exists")
         else:
             inode = Inode.from_bytes(self.disk.inodes[inode_ptr], config=self.config)
@@ -537,7 +775,7 @@ class Directory:  # NOTE: may have errors on '..' or '.' so please use abs path.
         return FileIO(self.disk, inode_ptr=inode_ptr, inode=inode, mode=mode)
 
 
-class FileIO(BytesIO):
+class FileIO(RawIOBase):  # NOTE: raw, the data lives in the inode, no internal buffer
     """Helper class for directory operations on an Inode"""
 
     class _PseudoMemview:
@@ -556,6 +794,8 @@ class FileIO(BytesIO):
         inode_ptr: int,
         inode: Inode,
         mode: FileMode = FileMode.READWRITE,
+        write_buffer_size: int | None = None,
+        read_buffer_size: int = 0,
     ):
         if inode.st_mode != InodeMode.REGULAR_FILE:
             raise IsADirectoryError(f"{inode.st_mode=} is not a REGULAR_FILE")
@@ -564,15 +804,37 @@ class FileIO(BytesIO):
         self.config = disk.config
         self.inode_io: InodeIO = InodeIO(inode, disk)
         self._closed: bool = False
-
-        self._readable = bool(mode & FileMode.READ)
-        self._writable = bool(mode & (FileMode.WRITE | FileMode.APPEND))
-        self._append = bool(mode & FileMode.APPEND)
-        self._truncate_on_open = bool(mode & FileMode.TRUNCATE)
+        # NOTE: set once the data changed, flush/close only write the inode back then,
+        # stamping st_mtime once per write back instead of once per write call
+        self._inode_dirty: bool = False
+        # NOTE: small contiguous writes are gathered here and written as one write_at
+        # once _wbuf_size is reached or before anything reads the file, _wbuf_pos is where
+        # the gathered bytes go; the first _wbuf_len bytes are in use, the bytearray is
+        # allocated on the first gathered write and kept, a flush never frees it
+        self._wbuf: bytearray = bytearray()
+        self._wbuf_pos: int = 0
+        self._wbuf_len: int = 0
+        # NOTE: writes smaller than this are gathered, a block by default; a streaming
+        # writer (an upload) can ask for more so its many small writes become few
+        self._wbuf_size: int = (
+            self.config.block_size if write_buffer_size is None else write_buffer_size
+        )
+        # NOTE: read ahead for a sequential reader (a download), a read smaller than
+        # _rbuf_size is served from _rbuf, the file data from _rbuf_pos fetched by one
+        # read_at; 0 turns it off, any write or truncate drops it
+        self._rbuf: bytes | None = None
+        self._rbuf_pos: int = 0
+        self._rbuf_size: int = read_buffer_size
+
+        raw: int = mode.value
+        self._readable = bool(raw & _M_READ)
+        self._writable = bool(raw & (_M_WRITE | _M_APPEND))
+        self._append = bool(raw & _M_APPEND)
+        self._truncate_on_open = bool(raw & _M_TRUNCATE)
 
         if self._truncate_on_open:  # truncate underlying inode to 0
             self.inode_io.truncate_to(0)
-            self.inode_io.inode.st_mtime = current_time_epoch()
+            self._inode_dirty = True
             self._pos = 0
         elif self._append:  # start at EOF
             self._pos = self.inode_io.get_size()
@@ -586,9 +848,27 @@ class FileIO(BytesIO):
     def close(self):
         if self._closed:
             return
-        self.disk.inodes[self.inode_ptr][:] = self.inode_io.inode.to_bytes(self.config)
+        self._write_inode_back()
         self._closed = True
 
+    def _flush_writes(self) -> None:
+        """Write the gathered small writes to the inode."""
+        wbuf_len: int = self._wbuf_len
+        if wbuf_len:
+            self.inode_io.write_at(self._wbuf_pos, memoryview(self._wbuf)[:wbuf_len])
+            self._wbuf_len = 0
+
+    def _write_inode_back(self) -> None:
+        """Persist the in-memory inode of this file to disk, if it changed."""
+        self._flush_writes()
+        if not self._inode_dirty:
+            return None
+        inode: Inode = self.inode_io.inode
+        inode.st_mtime = current_time_epoch()
+        self.disk.flush()  # NOTE: allocations first, then the inode that uses them
+        self.disk.inodes[self.inode_ptr][:] = inode.to_bytes(self.config)
+        self._inode_dirty = False
+
     def seekable(self) -> bool:
         return True
 
@@ -613,7 +893,7 @@ class FileIO(BytesIO):
         elif whence == SEEK_CUR:
             new_pos = self._pos + offset
         elif whence == SEEK_END:
-            new_pos = inode.st_size + offset
+            new_pos = self._size() + offset
         else:
             raise ValueError(f"Invalid whence value: {whence}")
 
@@ -637,9 +917,11 @@ class FileIO(BytesIO):
             size = self._pos
         if size < 0:
             raise ValueError("Negative truncate size")
+        self._flush_writes()
 
         self.inode_io.truncate_to(size)
-        inode.st_mtime = current_time_epoch()
+        self._inode_dirty = True
+        self._rbuf = None
 
         if self._pos > inode.st_size:
             self._pos = inode.st_size
@@ -655,10 +937,38 @@ class FileIO(BytesIO):
         if size is None:
             size = -1
 
-        data = self.inode_io.read_at(self._pos, size)
-        self._pos += len(data)
+        pos: int = self._pos
+        if 0 <= size < self._rbuf_size:
+            rbuf = self._rbuf
+            off: int = pos - self._rbuf_pos
+            # NOTE: a short buffer ended at EOF when fetched, nothing past it to read
+            if (
+                rbuf is None
+                or off < 0
+                or (off + size > len(rbuf) and len(rbuf) == self._rbuf_size)
+            ):
+                self._flush_writes()
+                rbuf = self._rbuf = self.inode_io.read_at(pos, self._rbuf_size)
+                self._rbuf_pos, off = pos, 0
+            data = rbuf[off : off + size]
+        else:
+            self._flush_writes()
+            data = self.inode_io.read_at(pos, size)
+        self._pos = pos + len(data)
         return data
 
+    def readinto(self, buffer: "bytearray | memoryview", /) -> int:  # type: ignore[override]
+        """Read into buffer from the current position, without an intermediate bytes"""
+        if self._closed:
+            raise ValueError("I/O operation on closed file")
+        if not self.readable():
+            raise IOError("File not open for reading")
+
+        self._flush_writes()
+        read = self.inode_io.readinto(buffer, self._pos)
+        self._pos += read
+        return read
+
     def write(self, buffer: ByteString) -> int:  # type: ignore[override]
         if self._closed:
             raise ValueError("I/O operation on closed file")
@@ -666,28 +976,59 @@ class FileIO(BytesIO):
             raise IOError("File not open for writing")
 
         if self._append:  # append mode: always write at EOF
-            self._pos = self.inode_io.get_size()
-
-        written = self.inode_io.write_at(self._pos, buffer)
-        self._pos += written
-        self.inode_io.inode.st_mtime = current_time_epoch()
-        return written
-
-    def getbuffer(self) -> "FileIO._PseudoMemview":  # type: ignore[override]
+            self._pos = self._size()
+
+        self._inode_dirty = True
+        self._rbuf = None
+        n: int = len(buffer)
+        wbuf_len: int = self._wbuf_len
+        if wbuf_len and self._wbuf_pos + wbuf_len != self._pos:
+            self._flush_writes()  # NOTE: not contiguous with the gathered bytes
+            wbuf_len = 0
+        if n == 0 or n >= self._wbuf_size:  # NOTE: b"" still extends up to _pos
+            self._flush_writes()
+            written = self.inode_io.write_at(self._pos, buffer)
+            self._pos += written
+            return written
+        if not wbuf_len:
+            self._wbuf_pos = self._pos
+        wbuf: bytearray = self._wbuf
+        if not wbuf:
+            wbuf = self._wbuf = bytearray(self._wbuf_size)
+        end: int = wbuf_len + n
+        wbuf[wbuf_len:end] = buffer  # NOTE: in place, grows only past _wbuf_size
+        self._wbuf_len = end
+        self._pos += n
+        if end >= self._wbuf_size:
+            self._flush_writes()
+        return n
+
+    def _size(self) -> int:
+        """Size of the file including the gathered writes not written yet."""
+        size: int = self.inode_io.get_size()
+        if self._wbuf_len:
+            return max(size, self._wbuf_pos + self._wbuf_len)
+        return size
+
+    def getbuffer(self) -> "FileIO._PseudoMemview":
         return self.__class__._PseudoMemview(
-            size=self.inode_io.get_size()
+            size=self._size()
         )  # just have .nbytes property
 
     def writelines(self, lines: Iterable[bytes]):  # type: ignore[override]
-        for line in lines:
-            self.write(line)
+        # NOTE: the lines are contiguous in the file, joined in C and written by one
+        # write call instead of running the block walk once per line; no lines is no
+        # write at all, write(b"") would extend the file up to the position
+        data = b"".join(lines)
+        if data:
+            self.write(data)
 
     def flush(self):
         """Force all pending data to be written to disk."""
         if self._closed:
             raise ValueError("I/O operation on closed file")
-        # ensure inode is persisted
-        self.disk.inodes[self.inode_ptr][:] = self.inode_io.inode.to_bytes(self.config)
+        # ensure inode is persisted, a file only read has nothing to write
+        self._write_inode_back()
 
     def __repr__(self) -> str:
         inode: Inode = self.inode_io.inode
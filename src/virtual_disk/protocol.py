@@ -4,39 +4,42 @@ from typing import ByteString, Iterator, Protocol, Self
 from .bitmap import Bitmap
 from .config import Config
 
+# NOTE: structural types checked by mypy, the views and lists built on every access
+# do not inherit from them, a Protocol base makes a typing._ProtocolMeta class
+
 
 class InodeView(Protocol):
-    def __len__(self) -> int:
-        raise NotImplementedError()
+    def __len__(self) -> int: ...
 
-    def __setitem__(self, idx: "slice[None, None, None]", value: ByteString, /):
-        raise NotImplementedError()
+    def __setitem__(
+        self, idx: "slice[int | None, int | None, None]", value: ByteString, /
+    ): ...
 
-    def __getitem__(self, idx: "slice[int, int, None]", /) -> ByteString:
-        raise NotImplementedError()
+    def __getitem__(self, idx: "slice[int, int, None]", /) -> ByteString: ...
 
 
 class BlockView(Protocol):
-    def __iter__(self) -> Iterator[int]:
-        raise NotImplementedError()
+    def __iter__(self) -> Iterator[int]: ...
 
     def __setitem__(
         self, idx: "slice[int | None, int | None, None]", value: ByteString, /
-    ):
-        raise NotImplementedError()
+    ): ...
 
-    def __getitem__(self, idx: "slice[int | None, int | None, None]", /) -> ByteString:
-        raise NotImplementedError()
+    def __getitem__(
+        self, idx: "slice[int | None, int | None, None]", /
+    ) -> ByteString: ...
 
 
 class InodesList(Protocol):
-    def __getitem__(self, idx: int, /) -> InodeView:
-        raise NotImplementedError()
+    def __getitem__(self, idx: int, /) -> InodeView: ...
 
 
 class BlocksList(Protocol):
-    def __getitem__(self, idx: int, /) -> BlockView:
-        raise NotImplementedError()
+    def __getitem__(self, idx: int, /) -> BlockView: ...
+
+    def read_run(self, idx: int, count: int, /) -> ByteString:
+        """Bytes of count physically consecutive blocks starting at idx."""
+        ...
 
 
 class Disk(Protocol):
@@ -52,6 +55,10 @@ class Disk(Protocol):
     def used_space(self) -> int: ...
     def reserved_space(self) -> int: ...
 
+    def flush(self) -> None:
+        """Persist pending allocation changes, called before an inode is written."""
+        ...
+
     @property
     def closed(self) -> bool: ...
     def close(self) -> None: ...
@@ -1,4 +1,10 @@
+import struct
 import time
+from functools import partial
+from typing import ByteString, Callable
+
+# NOTE: big endian unsigned widths struct can decode natively, others are packed as raw bytes
+NATIVE_INT_CODES: dict[int, str] = {1: "B", 2: "H", 4: "I", 8: "Q"}
 
 
 def ceil_division(a: int, b: int) -> int:
@@ -6,6 +12,15 @@ def ceil_division(a: int, b: int) -> int:
     return (a + b - 1) // b
 
 
+def ceil_divider(b: int) -> Callable[[int], int]:
+    """ceil(a/b) for a fixed b, a mask and a shift when b is a power of two."""
+    if b & (b - 1):
+        return lambda a: (a + b - 1) // b
+    shift: int = b.bit_length() - 1
+    mask: int = b - 1
+    return lambda a: (a + mask) >> shift
+
+
 def floor_division(a: int, b: int) -> int:
     """Return the floor of a divided by b, floor(a/b)."""
     return a // b
@@ -16,9 +31,42 @@ def current_time_epoch() -> int:
     return int(time.time())
 
 
-def abspath_to_paths(abspath: bytes) -> list[bytes]:
-    abspath = abspath.strip(b"/")
-    if abspath == b"":
-        return []
-    paths: list[bytes] = abspath.split(b"/")
-    return paths
+def abspath_to_paths(abspath: bytes) -> tuple[bytes, ...]:
+    # NOTE: one split, empty components (leading, trailing or repeated '/') dropped by
+    # a C level filter; a tuple, immutable so callers can share and cache it
+    return tuple(filter(None, abspath.split(b"/")))
+
+
+def int_code(width: int) -> str:
+    """struct format code of a big endian unsigned int of width bytes."""
+    return NATIVE_INT_CODES.get(width, f"{width}s")
+
+
+def addrs_struct(address_length: int, count: int) -> struct.Struct:
+    """Layout of count addresses packed back to back, eg. an indirect block."""
+    if address_length in NATIVE_INT_CODES:
+        return struct.Struct(f">{count}{NATIVE_INT_CODES[address_length]}")
+    return struct.Struct(">" + f"{address_length}s" * count)
+
+
+def addr_encoder(address_length: int) -> Callable[[int], bytes]:
+    """Encoder of one big endian address of address_length bytes."""
+    if address_length in NATIVE_INT_CODES:
+        return addrs_struct(address_length, 1).pack
+    return partial(int.to_bytes, length=address_length, byteorder="big", signed=False)
+
+
+def addr_decoder(address_length: int) -> Callable[[ByteString, int], int]:
+    """Decoder of one big endian address of address_length bytes at an offset of data."""
+    if address_length in NATIVE_INT_CODES:
+        unpack_from = addrs_struct(address_length, 1).unpack_from
+
+        def decode(data: ByteString, offset: int) -> int:
+            return unpack_from(data, offset)[0]
+
+        return decode
+
+    def decode_bytes(data: ByteString, offset: int) -> int:
+        return int.from_bytes(data[offset : offset + address_length], byteorder="big")
+
+    return decode_bytes
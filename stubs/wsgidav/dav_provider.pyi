@@ -1,7 +1,8 @@
-from io import BytesIO
+from io import IOBase
 
 class DAVProvider:
     _count_get_resource_inst: int
+    prop_manager: object | None
     def is_readonly(self) -> bool: ...
     
 class DAVNonCollection:
@@ -27,8 +28,9 @@ class DAVNonCollection:
     
     def move_recursive(self, dest_path: str) -> None: ...
     
-    def get_content(self) -> BytesIO: ...
-    def begin_write(self, *, content_type: str | None = None) -> BytesIO: ...
+    def get_content(self) -> IOBase: ...
+    def begin_write(self, *, content_type: str | None = None) -> IOBase: ...
+    def end_write(self, *, with_errors: bool) -> None: ...
     def delete(self) -> None: ...
 
     def copy_move_single(self, dest_path: str, *, is_move: bool) -> None: ...
@@ -59,6 +61,10 @@ class DAVCollection:
     
     def get_member_names(self) -> list[str]: ...
     def get_member(self, name: str) -> DAVNonCollection | DAVCollection | None: ...
+    def get_descendants(
+        self, *, add_self: bool = False
+    ) -> list[DAVNonCollection | DAVCollection]: ...
+    def support_recursive_delete(self) -> bool: ...
 
     def create_collection(self, name: str) -> None: ...
     def create_empty_resource(self, name: str) -> DAVNonCollection: ...
@@ -1,8 +1,10 @@
+from contextlib import contextmanager
 from functools import wraps
-from typing import Callable, ParamSpec, TypeVar
+from typing import Callable, Iterator, ParamSpec, TypeVar
 
 from src.virtual_disk.config import Config
 from src.virtual_disk.disk import InMemoryDisk
+from src.virtual_disk.inode import Inode, InodeIO, InodeMode
 
 config = Config(block_size=4096, inode_size=64, num_blocks=1024 * 128, num_inodes=1024)
 
@@ -27,8 +29,9 @@ def assert_disk_not_changed(func: Callable[P, R]) -> Callable[P, R]:
     def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
         root = disk.root
         root_before = root.inode_io.read_at(0)
-        super_block = disk.blocks[0]
-        super_inode = disk.inodes[0]
+        # NOTE: bytes copies, the disks hand out live views of the block and inode
+        super_block = bytes(disk.blocks[0][:])
+        super_inode = bytes(disk.inodes[0][:])
         free_block_before = disk.blocks_bitmap.free_count()
         free_inode_before = disk.inodes_bitmap.free_count()
 
@@ -41,9 +44,29 @@ def assert_disk_not_changed(func: Callable[P, R]) -> Callable[P, R]:
             "Inode bitmap changed"
         )
         assert root.inode_io.read_at(0) == root_before, "Root inode content changed"
-        assert disk.blocks[0] == super_block, "Superblock changed"
-        assert disk.inodes[0] == super_inode, "Super inode changed"
+        assert disk.blocks[0][:] == super_block, "Superblock changed"
+        assert disk.inodes[0][:] == super_inode, "Super inode changed"
 
         return result
 
     return wrapper
+
+
+@contextmanager
+def scratch_file(blocks: int = 0) -> Iterator[tuple[Inode, bytes]]:
+    """
+    Fresh regular file inode, truncated back to empty on exit.
+
+    With blocks > 0 it already holds that many blocks of a byte pattern
+    followed by a short tail, so reads cross block boundaries and end unaligned.
+    """
+    inode = Inode(st_mode=InodeMode.REGULAR_FILE)
+    inode_io = InodeIO(inode, disk)
+    data = b""
+    if blocks:
+        data = bytes(range(256)) * (config.block_size * blocks // 256) + b"tail"
+        inode_io.write_at(0, data)
+    try:
+        yield inode, data
+    finally:
+        inode_io.truncate_to(st_size=0)
@@ -0,0 +1,77 @@
+import pytest
+
+from src.virtual_disk.bitmap import Bitmap
+
+
+def test_free_count():
+    bitmap = Bitmap(13)  # NOTE: not a multiple of 8, last byte is partially used
+    assert bitmap.free_count() == 13
+
+    bitmap.set(0)
+    bitmap.set(7)
+    bitmap.set(12)
+    assert bitmap.free_count() == 10
+    assert bitmap.popcount() == 3
+
+    bitmap.clear(7)
+    assert bitmap.free_count() == 11
+
+
+def test_find_free():
+    bitmap = Bitmap(10)
+    for index in range(10):
+        assert bitmap.find_and_flip_free() == index
+
+    with pytest.raises(OSError):
+        bitmap.find_free()  # NOTE: padding bits 10..15 must never be handed out
+
+    bitmap.clear(3)
+    bitmap.clear(9)
+    assert bitmap.find_free() == 3
+    bitmap.set(3)
+    assert bitmap.find_free() == 9
+
+
+def test_find_free_skips_full_bytes():
+    bitmap = Bitmap(8 * 24 + 5)  # NOTE: 24 full bytes and a short last byte
+    for index in range(bitmap._size):
+        bitmap.set(index)
+    bitmap.clear(8 * 10 + 1)  # NOTE: the 0xFF run ends at byte 10
+    assert bitmap.find_free() == 8 * 10 + 1
+
+    bitmap.set(8 * 10 + 1)
+    bitmap.clear(bitmap._size - 1)
+    assert bitmap.find_free() == bitmap._size - 1
+
+
+def test_version_bumps_on_mutation():
+    bitmap = Bitmap(10)
+    assert bitmap._version == 0
+    bitmap.find_and_flip_free()
+    bitmap.clear(0)
+    assert bitmap._version == 2
+    bitmap.find_free()
+    bitmap.get(0)
+    assert bitmap._version == 2
+
+
+def test_iter_ones_and_zeros():
+    bitmap = Bitmap(8 * 8 + 13)  # NOTE: one full word and a short tail
+    ones = [0, 5, 63, 64, 70, 76]
+    for index in ones:
+        bitmap.set(index)
+
+    assert list(bitmap.iter_ones()) == ones
+    assert list(bitmap.iter_zeros()) == [
+        index for index in range(bitmap._size) if index not in ones
+    ]
+
+
+def test_set_range():
+    for start, stop in ((0, 0), (0, 5), (3, 7), (2, 21), (8, 16), (0, 29), (13, 29)):
+        bitmap = Bitmap(29)
+        bitmap.set_range(start, stop)
+        assert list(bitmap.iter_ones()) == list(range(start, stop))
+
+    with pytest.raises(IndexError):
+        Bitmap(29).set_range(0, 30)
@@ -31,3 +31,40 @@ def test_entry():
 
     assert inode_io.read_at(0) == b""
     assert len(list(root._iter_entries())) == 0
+
+
+@assert_disk_not_changed
+def test_new_writes_default_entries():
+    sub = disk.root.mkdir(b"new")
+    expected = Directory(disk, inode=Inode(InodeMode.DIRECTORY), inode_ptr=0)
+    expected._add_entry(b".", inode_ptr=sub.inode_ptr)
+    expected._add_entry(b"..", inode_ptr=0)
+
+    assert InodeIO(sub.inode_io.inode, disk).read_at(0) == expected._read_data()
+    assert disk.root.chdir(b"new").listdir(ignore_default=False) == [b".", b".."]
+    for name in (b".", b".."):
+        expected._remove_entry(name)
+    disk.root.rmdir(b"new")
+
+
+@assert_disk_not_changed
+def test_name_index_follows_entries():
+    inode = Inode(InodeMode.DIRECTORY)
+    root = Directory(disk, inode=inode, inode_ptr=0)
+
+    names = [b"entry-%d" % i for i in range(64)]
+    for i, name in enumerate(names):
+        root._add_entry(name, inode_ptr=i + 1)
+    assert root._find_entry(b"entry-7") == 8  # NOTE: index built after the adds
+    root._add_entry(b"late", inode_ptr=100)
+    root._remove_entry(b"entry-3")
+
+    fresh = Directory(disk, inode=inode, inode_ptr=0)
+    for name in [*names, b"late"]:
+        assert root._find_entry(name) == fresh._find_entry(name)
+    assert root._find_entry(b"entry-3") is None
+    assert root._read_data() == InodeIO(inode, disk).read_at(0)  # NOTE: cached data too
+
+    for name in root.listdir():
+        root._remove_entry(name)
+    assert InodeIO(inode, disk).read_at(0) == b""
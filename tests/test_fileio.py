@@ -1,7 +1,9 @@
-from src.virtual_disk.inode import Inode, InodeMode
-from src.virtual_disk.path import FileIO
+import pytest
 
-from . import assert_disk_not_changed, disk
+from src.virtual_disk.inode import Inode, InodeIO, InodeMode
+from src.virtual_disk.path import FileIO, FileMode
+
+from . import assert_disk_not_changed, disk, scratch_file
 
 
 @assert_disk_not_changed
@@ -17,3 +19,99 @@ def test_read_write():
         assert f.read() == data
         f.truncate(0)
         assert f.read(-1) == b""
+
+
+@assert_disk_not_changed
+def test_truncate_growth_allocates_blocks():
+    inode = Inode(st_mode=InodeMode.REGULAR_FILE)
+
+    with FileIO(disk, 1, inode) as f:
+        f.truncate(2563)  # NOTE: grows, the block is allocated instead of left NULL_PTR
+        assert inode.directs[0] != 0
+        f.seek(0, 2)
+        f.write(b"ab")
+        f.flush()
+        f.seek(0)
+        assert f.read() == bytes(2563) + b"ab"
+        f.truncate(0)
+
+
+@assert_disk_not_changed
+def test_unallocated_block_is_not_block_zero():
+    # NOTE: st_size without blocks, as left by a truncate growth of older versions
+    inode_io = InodeIO(Inode(st_mode=InodeMode.REGULAR_FILE, st_size=100), disk)
+    with pytest.raises(RuntimeError):
+        inode_io.read_at(0, 10)
+
+
+@assert_disk_not_changed
+def test_small_writes_are_gathered():
+    inode = Inode(st_mode=InodeMode.REGULAR_FILE)
+
+    with FileIO(disk, 1, inode) as f:
+        for i in range(1024):
+            f.write(b"%04d" % i)
+        assert f.seek(0, 2) == 4096  # NOTE: size counts the writes not written yet
+        f.seek(2)
+        f.write(b"xy")  # NOTE: not contiguous, the gathered bytes are written first
+        f.seek(0)
+        assert f.read(8) == b"00xy0001"
+        f.seek(10_000)
+        f.write(b"end")
+        assert inode.st_size == 4096
+        f.seek(0)
+        data = f.read()
+        assert len(data) == 10_003 and data[4096:10_000] == bytes(5904)
+        f.truncate(0)
+
+
+@assert_disk_not_changed
+def test_write_buffer_size():
+    block_size = disk.config.block_size
+
+    with (
+        scratch_file() as (inode, _),
+        FileIO(disk, 1, inode, write_buffer_size=4 * block_size) as f,
+    ):
+        chunk = b"c" * (block_size + 1)
+        for _ in range(3):
+            f.write(chunk)
+        assert inode.st_size == 0  # NOTE: still gathered, less than 4 blocks
+        f.write(chunk)
+        assert inode.st_size == 4 * len(chunk)
+        f.seek(0)
+        assert f.read() == chunk * 4
+
+
+@assert_disk_not_changed
+def test_read_buffer_size():
+    block_size = disk.config.block_size
+
+    with (
+        scratch_file(blocks=3) as (inode, data),
+        FileIO(disk, 1, inode, read_buffer_size=2 * block_size) as f,
+    ):
+        chunks = iter(lambda: f.read(1000), b"")
+        assert b"".join(chunks) == data
+        f.seek(block_size + 1)
+        assert f.read(10) == data[block_size + 1 : block_size + 11]
+        f.seek(5)
+        f.write(b"new")  # NOTE: drops the read ahead
+        f.seek(0)
+        assert f.read(10) == data[:5] + b"new" + data[8:10]
+
+
+@assert_disk_not_changed
+def test_writelines_without_lines():
+    inode = Inode(st_mode=InodeMode.REGULAR_FILE)
+
+    with FileIO(disk, 1, inode) as f:
+        f.seek(100)
+        f.writelines([])
+        assert f.seek(0, 2) == 0  # NOTE: not extended up to the position
+        f.seek(100)
+        f.writelines([b"ab", b"", b"cd"])
+        assert f.seek(0, 2) == 104
+        f.truncate(0)
+    with FileIO(disk, 1, inode, mode=FileMode.READ) as f:
+        f.writelines([])  # NOTE: nothing to write, no IOError on a read only file
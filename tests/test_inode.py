@@ -1,4 +1,5 @@
-from src.virtual_disk.inode import Inode, InodeMode
+from src.virtual_disk.config import Config
+from src.virtual_disk.inode import Inode, InodeMode, write_mtime
 
 from . import config
 
@@ -6,3 +7,27 @@ from . import config
 def test_encode_decode():
     inode = Inode(InodeMode.DIRECTORY)
     assert Inode.from_bytes(bytearray(inode.to_bytes(config)), config) == inode
+
+
+def test_write_mtime():
+    inode = Inode(InodeMode.REGULAR_FILE, st_size=12345)
+    data = bytearray(inode.to_bytes(config))
+    write_mtime(data, 1_700_000_000, config)
+    inode.st_mtime = 1_700_000_000
+    assert data == inode.to_bytes(config)
+
+
+def test_indirect_block_fits_pointers():
+    # NOTE: block pointers are wider than inode pointers in this config
+    assert config.block_addr_length > config.inode_addr_length
+    used = config.num_inode_addr_per_block * config.block_addr_length
+    assert used <= config.block_size
+
+
+def test_st_size_width_is_unchanged():
+    # NOTE: widths the inode layout had before per_block counted block pointers
+    assert Config(4096, 64, 2**20, 2**14).max_file_size_length == 6
+    small = Config(128, 64, 256, 2**16)  # NOTE: block addresses narrower than inode ones
+    assert small.num_inode_addr_per_block == 128 // 3  # NOTE: the count older versions used
+    assert small.max_file_size_length == 3
+    assert small.max_file_size == (12 + 42 + 42**2 + 42**3) * 128
@@ -1,6 +1,7 @@
+from src.virtual_disk.constants import NULL_BYTES
 from src.virtual_disk.inode import Inode, InodeIO, InodeMode
 
-from . import assert_disk_not_changed, disk
+from . import assert_disk_not_changed, disk, scratch_file
 
 
 @assert_disk_not_changed
@@ -14,3 +15,47 @@ def test_read_write():
     assert root_io.read_at(0, n=-1) == data
     root_io.truncate_to(st_size=0)
     assert root_io.read_at(0, n=-1) == b""
+
+
+@assert_disk_not_changed
+def test_read_at_unaligned_ranges():
+    block_size = disk.config.block_size
+    with scratch_file(blocks=3) as (root, data):
+        root_io = InodeIO(root, disk)
+        for pos, n in (
+            (0, 1),
+            (block_size - 1, 2),  # NOTE: crosses a block boundary
+            (10, block_size),
+            (block_size, block_size),  # NOTE: exactly one aligned block
+            (5, 2 * block_size + 7),
+            (len(data) - 3, 100),  # NOTE: clamped at EOF
+            (len(data), 1),
+        ):
+            assert root_io.read_at(pos, n) == data[pos : pos + n]
+
+
+@assert_disk_not_changed
+def test_write_past_eof_fills_gap_with_null_bytes():
+    root = Inode(st_mode=InodeMode.REGULAR_FILE)
+    root_io = InodeIO(root, disk)
+
+    block_size = disk.config.block_size
+    root_io.write_at(0, b"x" * (block_size + 10))
+    root_io.truncate_to(st_size=5)  # NOTE: old bytes stay in the block past st_size
+    gap_end = 3 * block_size + 7
+    assert root_io.write_at(gap_end, b"end") == 3
+    assert root_io.read_at(0) == b"x" * 5 + NULL_BYTES * (gap_end - 5) + b"end"
+    root_io.truncate_to(st_size=0)
+
+
+@assert_disk_not_changed
+def test_readinto_caller_buffer():
+    block_size = disk.config.block_size
+    with scratch_file(blocks=2) as (root, data):
+        root_io = InodeIO(root, disk)
+        buffer = bytearray(block_size + 10)
+        assert root_io.readinto(buffer, 3) == len(buffer)
+        assert buffer == data[3 : 3 + len(buffer)]
+        assert root_io.readinto(memoryview(buffer)[:8], len(data) - 4) == 4  # NOTE: EOF
+        assert buffer[:4] == b"tail"
+        assert root_io.readinto(buffer, len(data)) == 0
@@ -222,6 +222,45 @@ def test_directory_traversal_nested_depth():
     root.rm_tree(b"deep")
 
 
+@assert_disk_not_changed
+def test_iter_tree_and_listtree():
+    root = disk.root
+    top = root.mkdir(b"tree")
+    top.makedirs(b"a", b"b")
+    top.create_empty_file(b"f")
+    top.chdir(b"a").create_empty_file(b"g")
+
+    assert list(top.iter_tree()) == [
+        (0, b"a", True),
+        (1, b"b", True),
+        (1, b"g", False),
+        (0, b"f", False),
+    ]
+    assert top.listtree() == [(b"a", [(b"b", []), b"g"]), b"f"]
+    assert top.listtree(ignore_default=False) == [
+        b".",
+        b"..",
+        (b"a", [b".", b"..", (b"b", [b".", b".."]), b"g"]),
+        b"f",
+    ]
+    root.rm_tree(b"tree")
+
+
+@assert_disk_not_changed
+def test_scan_children():
+    root = disk.root
+    top = root.mkdir(b"scan")
+    top.mkdir(b"d")
+    top.create_empty_file(b"f")
+
+    children = top.scan_children()
+    assert list(children) == [b"d", b"f"]
+    for name, result in children.items():
+        assert result == top.get_childs_inode(name)
+    assert list(top.scan_children(ignore_default=False)) == [b".", b"..", b"d", b"f"]
+    root.rm_tree(b"scan")
+
+
 @assert_disk_not_changed
 def test_copy_tree_overwrite_false_and_true():
     root = disk.root
@@ -242,6 +281,29 @@ def test_copy_tree_overwrite_false_and_true():
     root.rm_tree(b"B")
 
 
+@assert_disk_not_changed
+def test_copy_tree_failure_keeps_copied_files():
+    root = disk.root
+    src = root.mkdir(b"src", exist_ok=True)
+    with src.open(b"a", mode=FileMode.CREATE | FileMode.WRITE) as f:
+        f.write(b"a" * 1000)
+    with src.open(b"z", mode=FileMode.CREATE | FileMode.WRITE) as f:
+        f.write(b"z")
+    dst = root.mkdir(b"dst", exist_ok=True)
+    with dst.open(b"z", mode=FileMode.CREATE | FileMode.WRITE) as f:
+        f.write(b"old")
+    with pytest.raises(FileExistsError):
+        root.copy_tree([b"src"], [b".", b"dst"], overwrite=False)
+    dst = root.chdir(b"dst")
+    # NOTE: the files copied before the failure are complete, not left empty
+    with dst.open(b"a", mode=FileMode.READ) as f:
+        assert f.read() == b"a" * 1000
+    with dst.open(b"z", mode=FileMode.READ) as f:
+        assert f.read() == b"old"
+    root.rm_tree(b"src")
+    root.rm_tree(b"dst")
+
+
 @assert_disk_not_changed
 def test_remove_nonexistent_file_and_nonempty_dir_errors():
     root = disk.root
@@ -291,16 +353,18 @@ def test_multiple_create_flags_and_recreate_behavior():
 @assert_disk_not_changed
 def test_large_file():
     root = disk.root
-    data = bytearray(i % 255 for i in range(1024 * 1024))  # 1 MB
+    size = 1024 * 1024  # 1 MB
+    # NOTE: the i % 255 pattern by repeating one period in C, not a generator per byte
+    data = bytearray(bytes(range(255)) * (size // 255) + bytes(range(size % 255)))
     repeate = 4
     with root.open(
         b"home.txt", FileMode.WRITE | FileMode.CREATE | FileMode.EXCLUSIVE
     ) as f:
-        for _ in range(repeate):
-            f.write(data)
+        f.writelines([data] * repeate)
     with root.open(b"home.txt") as f:
-        for _ in range(repeate):
-            assert f.read(1024 * 1024) == data
+        content = f.read(len(data) * repeate)
+    for i in range(repeate):
+        assert content[i * len(data) : (i + 1) * len(data)] == data
     root.remove(b"home.txt")
 
 
@@ -1,24 +1,50 @@
-from io import BytesIO
+import threading
+from functools import lru_cache
+from itertools import islice
 
 from wsgidav import util
 from wsgidav.dav_error import HTTP_FORBIDDEN, DAVError
 from wsgidav.dav_provider import DAVNonCollection, DAVProvider
 
 from src.virtual_disk.config import Config
+from src.virtual_disk.inode import write_mtime
 from src.virtual_disk.path import Directory, FileIO, FileMode
 from src.virtual_disk.protocol import Disk
 from src.virtual_disk.utils import abspath_to_paths
 
-import threading
+# NOTE: striped lock table, inode_ptr picks one of a fixed set of locks, no dict and no
+# global lock guarding it; two files may share a stripe, which only serializes them
+FILE_LOCK_STRIPES: int = 256  # NOTE: power of two, the stripe is a mask of inode_ptr
+_FILE_LOCK_MASK: int = FILE_LOCK_STRIPES - 1
+FILE_LOCKS: tuple[threading.Lock, ...] = tuple(
+    threading.Lock() for _ in range(FILE_LOCK_STRIPES)
+)
+
+
+def get_file_lock(inode_ptr: int) -> threading.Lock:
+    # NOTE: a read of an immutable tuple, no check then insert so nothing to double check
+    return FILE_LOCKS[inode_ptr & _FILE_LOCK_MASK]
+
+
+# NOTE: wsgidav streams an upload in small chunks, they are gathered into writes of
+# about this size so the block walk of InodeIO.write_at runs once per MB
+UPLOAD_WRITE_BUFFER_SIZE: int = 1024 * 1024
+# NOTE: and a download reads it in small chunks too, read ahead that much per read_at
+DOWNLOAD_READ_BUFFER_SIZE: int = 1024 * 1024
 
-# FILE_LOCKS: dict[int, threading.Lock] = {}  # map inode_ptr -> Lock
-# FILE_LOCKS_LOCK = threading.Lock()
 
-# def get_file_lock(inode_ptr: int) -> threading.Lock:
-#     with FILE_LOCKS_LOCK:
-#         if inode_ptr not in FILE_LOCKS:
-#             FILE_LOCKS[inode_ptr] = threading.Lock()
-#         return FILE_LOCKS[inode_ptr]
+@lru_cache(maxsize=4096)
+def _guess_mime(extensions: str) -> str:
+    return util.guess_mime_type(f"x.{extensions}" if extensions else "x")
+
+
+def guess_mime_type(path: str) -> str:
+    """util.guess_mime_type of path, cached by the extensions of its name."""
+    # NOTE: mimetypes only looks at the trailing extensions (".tar.gz" too), so every
+    # name with the same extensions gets the same answer; leading dots are no extension
+    name: str = path.rpartition("/")[2].lstrip(".")
+    return _guess_mime(name.partition(".")[2])
+
 
 class CustomFileResource(DAVNonCollection):
     """Represents a single existing DAV resource instance.
@@ -27,14 +53,24 @@ class CustomFileResource(DAVNonCollection):
     """
 
     def __init__(
-        self, root: Directory, abspath: list[bytes], *, path: str, environ: dict
+        self,
+        root: Directory,
+        abspath: tuple[bytes, ...],
+        *,
+        path: str,
+        environ: dict,
+        initial_inode: Directory._InodeResult | None = None,
     ):
         super().__init__(path, environ)
-        self.abspath: list[bytes] = abspath
+        self.abspath: tuple[bytes, ...] = abspath
         self.root: Directory = root
         self.fs_opts: DAVProvider = self.provider
         self._move_deleted: bool = False
-        # self._write_lock: threading.Lock | None = None
+        # NOTE: resolved once per resource, every live property getter reuses the walk;
+        # a caller that already resolved abspath hands its result in
+        self._inode_result: Directory._InodeResult | None = initial_inode
+        # NOTE: the stripe lock of this file, held from begin_write until end_write
+        self._write_lock: threading.Lock | None = None
 
     @property
     def disk(self) -> Disk:
@@ -45,34 +81,48 @@ class CustomFileResource(DAVNonCollection):
         return self.disk.config
 
     def assert_get_childs_inode(self, *names: bytes) -> Directory._InodeResult:
+        if self._inode_result is not None and names == self.abspath:
+            return self._inode_result
         result = self.root.get_childs_inode(*names)
+        if names == self.abspath:
+            self._inode_result = result
         if result is None:
-            raise RuntimeError(
-                f"{self.abspath=} is not found, TREE: {self.root.listtree()=}"
-            )
+            # NOTE: only the start of the tree, a full listtree of a large disk in an
+            # error message is a memory spike of its own
+            tree = list(islice(self.root.iter_tree(), 64))
+            raise RuntimeError(f"{names=} is not found, TREE (first 64): {tree}")
+        return result
+
+    def _resolved(self) -> Directory._InodeResult:
+        """The inode of this resource, the live inode object every getter reads."""
+        # NOTE: no frozen stat snapshot, writes through begin_write update this inode
+        # in place, so size and mtime read from it are never stale
+        result = self._inode_result
+        if result is None:
+            result = self.assert_get_childs_inode(*self.abspath)
         return result
 
     # Getter methods for standard live properties
     def get_content_length(self) -> int:
-        result = self.assert_get_childs_inode(*self.abspath)
+        result = self._resolved()
         return result.inode.st_size
 
     def get_content_type(self) -> str:
-        return util.guess_mime_type(self.path)
+        return guess_mime_type(self.path)
 
     def get_creation_date(self) -> int:
-        result = self.assert_get_childs_inode(*self.abspath)
+        result = self._resolved()
         return result.inode.st_ctime
 
     def get_display_name(self) -> str:
         return self.name
 
     def get_etag(self) -> str:  # pyright: ignore[reportIncompatibleMethodOverride]
-        result = self.assert_get_childs_inode(*self.abspath)
-        return f"{result.inode_ptr}-{result.inode.st_mtime}-{result.inode.st_size}"
+        inode, inode_ptr = self._resolved()
+        return f"{inode_ptr}-{inode.st_mtime}-{inode.st_size}"
 
     def get_last_modified(self) -> int:  # pyright: ignore[reportIncompatibleMethodOverride]
-        result = self.assert_get_childs_inode(*self.abspath)
+        result = self._resolved()
         return result.inode.st_mtime
 
     def is_link(self) -> bool:  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -87,42 +137,48 @@ class CustomFileResource(DAVNonCollection):
     def support_recursive_move(self, dest_path: str) -> bool:
         return False
 
-    def get_content(self) -> BytesIO:
+    def get_content(self) -> FileIO:
         """Open content as a stream for reading.
 
         See DAVResource.get_content()
         """
-        result = self.assert_get_childs_inode(*self.abspath)
+        result = self._resolved()
         return FileIO(
             disk=self.disk,
             inode_ptr=result.inode_ptr,
             inode=result.inode,
             mode=FileMode.READ,
+            read_buffer_size=DOWNLOAD_READ_BUFFER_SIZE,
         )
 
-    def begin_write(self, *, content_type: str | None = None) -> BytesIO:  # pyright: ignore[reportIncompatibleMethodOverride]
+    def begin_write(self, *, content_type: str | None = None) -> FileIO:  # pyright: ignore[reportIncompatibleMethodOverride]
         if self.provider.is_readonly():  # ...
             raise DAVError(HTTP_FORBIDDEN)
-        result = self.assert_get_childs_inode(*self.abspath)
-        
-        # lock = get_file_lock(result.inode_ptr)
-        # lock.acquire()  # Exclusive write
-        # self._write_lock = lock
+        result = self._resolved()
+
+        lock = get_file_lock(result.inode_ptr)
+        lock.acquire()  # Exclusive write
+        self._write_lock = lock
+        try:
+            return FileIO(
+                disk=self.disk,
+                inode_ptr=result.inode_ptr,
+                inode=result.inode,
+                mode=FileMode.WRITE,
+                write_buffer_size=UPLOAD_WRITE_BUFFER_SIZE,
+            )
+        except BaseException:
+            self._write_lock = None
+            lock.release()
+            raise
 
-        return FileIO(
-            disk=self.disk,
-            inode_ptr=result.inode_ptr,
-            inode=result.inode,
-            mode=FileMode.WRITE,
-        )
-    
-    # def end_write(self, *, with_errors):
-        
-    #     # Always release lock
-    #     if self._write_lock is not None:
-    #         self._write_lock.release()
+    def end_write(self, *, with_errors: bool) -> None:
+        # Always release lock, wsgidav calls end_write also when the upload failed
+        lock, self._write_lock = self._write_lock, None
+        if lock is not None:
+            lock.release()
 
-    #     return super().end_write(with_errors=with_errors)
+        return super().end_write(with_errors=with_errors)
 
     def delete(self) -> None:
         """Remove this resource or collection (recursive).
@@ -150,14 +206,16 @@ class CustomFileResource(DAVNonCollection):
         if self.provider.is_readonly():
             raise DAVError(HTTP_FORBIDDEN)
 
-        paths: list[bytes] = abspath_to_paths(dest_path.encode("utf-8"))
+        paths: tuple[bytes, ...] = abspath_to_paths(dest_path.encode("utf-8"))
 
         if is_move:
             self.root.rename(src=self.abspath, dest=paths)
             self._move_deleted = True
             return None
 
-        chunk_size = 1024 * 1024 * 32  # 32 MB at a time
+        # NOTE: 1 MB at a time, one buffer reused for the whole copy; a 32 MB chunk only
+        # made every COPY allocate (and zero) 32 MB without copying any faster
+        chunk_size = 1024 * 1024
 
         self.root.copy_file(
             src=self.abspath, dest=paths, overwrite=True, chunk_size=chunk_size
@@ -172,7 +230,8 @@ class CustomFileResource(DAVNonCollection):
         if secs is None:
             raise ValueError(f"Unable to Parse {time_stamp=}")
         if not dry_run:
-            result = self.assert_get_childs_inode(*self.abspath)
+            result = self._resolved()
             result.inode.st_mtime = secs
-            self.disk.inodes[result.inode_ptr][:] = result.inode.to_bytes(self.config)
+            # NOTE: only the mtime bytes change, the cached result was updated in place
+            write_mtime(self.disk.inodes[result.inode_ptr], secs, self.config)
         return True
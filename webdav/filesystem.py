@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from wsgidav import util
 from wsgidav.dav_error import HTTP_FORBIDDEN, DAVError
 from wsgidav.dav_provider import DAVCollection, DAVNonCollection, DAVProvider
@@ -10,6 +12,13 @@ from .file_resource import CustomFileResource
 from .folder_resource import CustomFolderResource
 
 
+@lru_cache(maxsize=4096)
+def _paths_for(path: str) -> tuple[bytes, ...]:
+    # NOTE: PROPFIND cycles hit the same URIs over and over, encode+split once per URI;
+    # the tuple is shared as is by every resource built for that URI
+    return abspath_to_paths(path.encode("utf-8"))
+
+
 class CustomFilesystemProvider(DAVProvider):
     def __init__(self, root: Directory, *, readonly=False):
         super().__init__()
@@ -30,7 +39,7 @@ class CustomFilesystemProvider(DAVProvider):
 
         root: Directory = self.root
 
-        paths: list[bytes] = abspath_to_paths(path.encode("utf-8"))
+        paths: tuple[bytes, ...] = _paths_for(path)
         try:
             result = root.get_childs_inode(*paths)
         except NotADirectoryError as nad:
@@ -40,6 +49,16 @@ class CustomFilesystemProvider(DAVProvider):
             return None
         if result.inode.st_mode == InodeMode.DIRECTORY:
             return CustomFolderResource(
-                root=root, abspath=paths, environ=environ, path=path
+                root=root,
+                abspath=paths,
+                environ=environ,
+                path=path,
+                initial_inode=result,
             )
-        return CustomFileResource(root=root, abspath=paths, environ=environ, path=path)
+        return CustomFileResource(
+            root=root,
+            abspath=paths,
+            environ=environ,
+            path=path,
+            initial_inode=result,
+        )
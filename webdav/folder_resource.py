@@ -1,9 +1,11 @@
+from itertools import islice
+
 from wsgidav import util
 from wsgidav.dav_error import HTTP_FORBIDDEN, DAVError
 from wsgidav.dav_provider import DAVCollection, DAVNonCollection, DAVProvider
 
 from src.virtual_disk.config import Config
-from src.virtual_disk.inode import InodeMode
+from src.virtual_disk.inode import InodeMode, write_mtime
 from src.virtual_disk.path import Directory
 from src.virtual_disk.protocol import Disk
 from src.virtual_disk.utils import abspath_to_paths
@@ -18,13 +20,28 @@ class CustomFolderResource(DAVCollection):
     """
 
     def __init__(
-        self, root: Directory, abspath: list[bytes], *, path: str, environ: dict
+        self,
+        root: Directory,
+        abspath: tuple[bytes, ...],
+        *,
+        path: str,
+        environ: dict,
+        initial_inode: Directory._InodeResult | None = None,
     ):
         super().__init__(path, environ)
-        self.abspath: list[bytes] = abspath
+        self.abspath: tuple[bytes, ...] = abspath
         self.root: Directory = root
         self.fs_opts: DAVProvider = self.provider
         self._move_deleted: bool = False
+        # NOTE: resolved once per resource, every live property getter reuses the walk;
+        # a caller that already resolved abspath hands its result in
+        self._inode_result: Directory._InodeResult | None = initial_inode
+        # NOTE: filled by get_member_names, a PROPFIND then asks get_member for every
+        # name and each one is answered from here instead of a walk from the root; keyed
+        # by the decoded name with the child abspath, so get_member never encodes it again
+        self._children: (
+            dict[str, tuple[tuple[bytes, ...], Directory._InodeResult]] | None
+        ) = None
 
     @property
     def disk(self) -> Disk:
@@ -35,16 +52,30 @@ class CustomFolderResource(DAVCollection):
         return self.disk.config
 
     def assert_get_childs_inode(self, *names: bytes) -> Directory._InodeResult:
+        if self._inode_result is not None and names == self.abspath:
+            return self._inode_result
         result = self.root.get_childs_inode(*names)
+        if names == self.abspath:
+            self._inode_result = result
         if result is None:
-            raise RuntimeError(
-                f"{self.abspath=} is not found, TREE: {self.root.listtree()=}"
-            )
+            # NOTE: only the start of the tree, a full listtree of a large disk in an
+            # error message is a memory spike of its own
+            tree = list(islice(self.root.iter_tree(), 64))
+            raise RuntimeError(f"{names=} is not found, TREE (first 64): {tree}")
+        return result
+
+    def _resolved(self) -> Directory._InodeResult:
+        """The inode of this folder, resolved once and shared by every getter."""
+        # NOTE: set_last_modified is the only change made through this resource, it
+        # sets st_mtime on the cached inode too, so the getters never see a stale mtime
+        result = self._inode_result
+        if result is None:
+            result = self.assert_get_childs_inode(*self.abspath)
         return result
 
     # Getter methods for standard live properties
     def get_creation_date(self) -> int:
-        result = self.assert_get_childs_inode(*self.abspath)
+        result = self._resolved()
         return result.inode.st_ctime
 
     def get_display_name(self) -> str:
@@ -65,7 +96,7 @@ class CustomFolderResource(DAVCollection):
         return self.disk.blocks_bitmap.free_count() * self.disk.config.block_size
 
     def get_last_modified(self) -> int:  # pyright: ignore[reportIncompatibleMethodOverride]
-        result = self.assert_get_childs_inode(*self.abspath)
+        result = self._resolved()
         return result.inode.st_mtime
 
     def is_link(self) -> bool:  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -74,27 +105,50 @@ class CustomFolderResource(DAVCollection):
     def support_recursive_move(self, dest_path: str) -> bool:  # pyright: ignore[reportIncompatibleMethodOverride]
         return True
 
+    def support_recursive_delete(self) -> bool:  # pyright: ignore[reportIncompatibleMethodOverride]
+        # NOTE: delete() frees the subtree with one rm_tree and one recursive lock sweep,
+        # otherwise wsgidav deletes every descendant on its own, leaves first
+        return True
+
     def get_member_names(self) -> list[str]:
-        directory = self.root.chdir(*self.abspath)
-        return [name.decode("utf-8") for name in directory.listdir()]
+        children = self._children
+        if children is None:  # NOTE: later calls reuse the decoded names, no rescan
+            directory = self.root.chdir(*self.abspath)
+            abspath = self.abspath
+            self._children = children = {
+                name.decode("utf-8"): ((*abspath, name), result)
+                for name, result in directory.scan_children().items()
+            }
+        return list(children)
 
     def get_member(self, name: str) -> DAVNonCollection | DAVCollection | None:
-        new_abs_path: list[bytes] = [*self.abspath, name.encode("utf-8")]
-        result = self.root.get_childs_inode(*new_abs_path)
-        if result is None:
-            return None
+        new_abs_path: tuple[bytes, ...]
+        result: Directory._InodeResult | None
+        children = self._children
+        if children is not None:
+            child = children.get(name)
+            if child is None:
+                return None
+            new_abs_path, result = child
+        else:
+            new_abs_path = (*self.abspath, name.encode("utf-8"))
+            result = self.root.get_childs_inode(*new_abs_path)
+            if result is None:
+                return None
         if result.inode.st_mode == InodeMode.DIRECTORY:
             return CustomFolderResource(
                 self.root,
                 abspath=new_abs_path,
                 path=util.join_uri(self.path, name),
                 environ=self.environ,
+                initial_inode=result,
             )
         return CustomFileResource(
             self.root,
             new_abs_path,
             path=util.join_uri(self.path, name),
             environ=self.environ,
+            initial_inode=result,
         )
 
     # --- Read / write -------------------------------------------------------
@@ -103,6 +157,7 @@ class CustomFolderResource(DAVCollection):
         if self.provider.is_readonly():
             raise DAVError(HTTP_FORBIDDEN)
         self.root.makedirs(*self.abspath, name.encode("utf-8"), exist_ok=False)
+        self._children = None
 
     def create_empty_resource(self, name: str) -> DAVNonCollection:
         """Create an empty (length-0) resource.
@@ -114,13 +169,15 @@ class CustomFolderResource(DAVCollection):
             raise DAVError(HTTP_FORBIDDEN)
         encode_name = name.encode("utf-8")
         directory = self.root.chdir(*self.abspath)
-        directory.create_empty_file(encode_name)
+        result = directory.create_empty_file(encode_name)
+        self._children = None
 
         return CustomFileResource(
             self.root,
-            abspath=[*self.abspath, encode_name],
+            abspath=(*self.abspath, encode_name),
             path=util.join_uri(self.path, name),
             environ=self.environ,
+            initial_inode=result,
         )
 
     def delete(self) -> None:  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -132,8 +189,14 @@ class CustomFolderResource(DAVCollection):
             raise DAVError(HTTP_FORBIDDEN)
         if not self._move_deleted:
             *parent_path, name = self.abspath  # auto prevent root delete
+            if self.provider.prop_manager:
+                # NOTE: dead properties are stored per URL, recursive is not applied to
+                # them, so the descendants drop theirs while they still exist
+                for child in self.get_descendants(add_self=False):
+                    child.remove_all_properties(recursive=False)
             parent = self.root.chdir(*parent_path)
             parent.rm_tree(name)
+            self._children = None
         else:
             util._logger.debug(
                 f"delete(): {self.path} already gone, skipping; {self._move_deleted=}"
@@ -145,18 +208,20 @@ class CustomFolderResource(DAVCollection):
         if self.provider.is_readonly():
             raise DAVError(HTTP_FORBIDDEN)
 
-        paths: list[bytes] = abspath_to_paths(dest_path.encode("utf-8"))
+        paths: tuple[bytes, ...] = abspath_to_paths(dest_path.encode("utf-8"))
         self.root.rename(src=self.abspath, dest=paths)
         self._move_deleted = True
+        self._children = None
 
     def copy_move_single(self, dest_path: str, *, is_move: bool) -> None:  # pyright: ignore[reportIncompatibleMethodOverride]
         """See DAVResource.copy_move_single()"""
         if self.provider.is_readonly():
             raise DAVError(HTTP_FORBIDDEN)
 
-        paths: list[bytes] = abspath_to_paths(dest_path.encode("utf-8"))
+        paths: tuple[bytes, ...] = abspath_to_paths(dest_path.encode("utf-8"))
 
         self.root.makedirs(*paths, exist_ok=False)
+        self._children = None  # NOTE: the destination may be below this folder
 
     def set_last_modified(
         self, dest_path: str, time_stamp: str, *, dry_run: bool
@@ -167,7 +232,8 @@ class CustomFolderResource(DAVCollection):
             raise ValueError(f"Unable to Parse {time_stamp=}")
 
         if not dry_run:
-            result = self.assert_get_childs_inode(*self.abspath)
+            result = self._resolved()
             result.inode.st_mtime = secs
-            self.disk.inodes[result.inode_ptr][:] = result.inode.to_bytes(self.config)
+            # NOTE: only the mtime bytes change, the cached result was updated in place
+            write_mtime(self.disk.inodes[result.inode_ptr], secs, self.config)
         return True